@@ -6,7 +6,7 @@ setup(
     author='Charles Jekel',
     author_email='cjekel@gmail.com',
     packages=packages,
-    package_data={'toleranceinterval': ['VERSION']},
+    package_data={'toleranceinterval': ['VERSION', 'hk_table.npz']},
     py_modules=['toleranceinterval.__init__'],
     url='https://github.com/cjekel/tolerance_interval_py',
     license='MIT License',
@@ -17,7 +17,6 @@ setup(
     install_requires=[
         "numpy >= 1.14.0",
         "scipy >= 0.19.0",
-        "sympy >= 1.4",
         "setuptools >= 38.6.0",
     ],
     python_requires=">3.5",
@@ -6,9 +6,13 @@ import unittest
 
 class TestEverything(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(121)
+
     def test_assert_2d_sort(self):
         for i in range(10):
-            x = np.random.random(5)
+            x = self.rng.random(5)
             x = checks.numpy_array(x)
             x_sort = x.copy()
             x_sort.sort()
@@ -19,7 +23,7 @@ class TestEverything(unittest.TestCase):
 
     def test_x_unmodified(self):
         for i in range(10):
-            x = np.random.random(5)
+            x = self.rng.random(5)
             x = checks.numpy_array(x)
             x.sort()
             x[0] = 12919.1
@@ -28,6 +32,41 @@ class TestEverything(unittest.TestCase):
             self.assertTrue(np.isclose(xnew[0, -1], 12919.1))
             self.assertTrue(np.isclose(x[0], 12919.1))
 
+    def test_assert_2d_partition(self):
+        # single kth, end points only, and several interior kth (sorted)
+        for kth in [[7], [0, 19], [0, 7, 19], [3, 16]]:
+            for i in range(10):
+                x = self.rng.random(20)
+                x_sort = np.sort(x)
+                x_part = checks.assert_2d_partition(x, kth)
+                self.assertEqual(x_part.shape, (1, 20))
+                for k in kth:
+                    self.assertEqual(x_part[0, k], x_sort[k])
+                self.assertFalse(np.shares_memory(x, x_part))
+
+    def test_numpy_array(self):
+        x = self.rng.random(5)
+        self.assertIs(checks.numpy_array(x), x)
+        x = checks.numpy_array([[1.0, 2.0], [3.0, 4.0]])
+        self.assertIsInstance(x, np.ndarray)
+        self.assertEqual(x.shape, (2, 2))
+
+    def test_mean_std(self):
+        for x in [self.rng.random((4, 30)), np.arange(12).reshape(2, 6),
+                  self.rng.random((4, 30)).astype(np.float32)]:
+            mean, std = checks.mean_std(x)
+            self.assertTrue(np.allclose(mean, x.mean(axis=1)))
+            self.assertTrue(np.allclose(std, x.std(axis=1, ddof=1)))
+            self.assertEqual(std.dtype, checks.float_dtype(x))
+            y = x.copy()
+            mean_y, std_y = checks.mean_std(y, overwrite_x=True)
+            self.assertTrue(np.array_equal(mean_y, mean))
+            self.assertTrue(np.array_equal(std_y, std))
+
+    def test_value_error(self):
+        with self.assertRaises(ValueError):
+            checks.assert_2d_partition(self.rng.random((2, 2, 2)), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,6 @@
 # -- coding: utf-8 --
-from toleranceinterval.hk import HansonKoopmans
+import numpy as np
+from toleranceinterval.hk import HansonKoopmans, vangel_approx
 import unittest
 
 
@@ -17,6 +18,45 @@ class TestEverything(unittest.TestCase):
         with self.assertRaises(ValueError):
             _ = HansonKoopmans(.1, 0.9, 10, -200)
 
+    def test_vangel_approx_broadcast(self):
+        n = np.array([10, 20, 30])
+        j = n - 1
+        b = vangel_approx(n, 1, j + 1, 0.1, 0.95)
+        for k in range(n.size):
+            myhk = HansonKoopmans(0.1, 0.95, n[k], j[k])
+            self.assertEqual(b[k], myhk.vangel_approx())
+
+    def test_secant_exact_root(self):
+        # pi(B) hits g exactly on [1.9, 2.1], the secant stops at the root
+        myhk = HansonKoopmans(0.1, 0.9, 10, 9)
+        g = myhk.g
+        myhk.piB = lambda B: g + min(B - 1.9, 0.) + max(B - 2.1, 0.)
+        B, un_conv, count = myhk.secant_solver(2.0)
+        self.assertEqual(myhk.piB(B), g)
+        self.assertFalse(un_conv)
+        B, un_conv, count = myhk.secant_solver(1.0)
+        self.assertEqual(myhk.piB(B), g)
+        self.assertFalse(un_conv)
+
+    def test_brentq_no_bracket(self):
+        # pi(B) stays below g, or is nan, so no root can be bracketed
+        myhk = HansonKoopmans(0.1, 0.9, 10, 9)
+        for pi in [myhk.g - 0.5, np.nan]:
+            myhk.piB = lambda B: pi
+            B, un_conv, count = myhk.brentq_solver(1.0, max_iter=10)
+            self.assertTrue(np.isnan(B))
+            self.assertTrue(un_conv)
+
+    def test_large_n(self):
+        # n!/(nj!*(j-1)!) overflows a double for a mid j and large n
+        for method in ['secant', 'newton-raphson', 'halley', 'brentq']:
+            myhk = HansonKoopmans(1e-4, 0.95, 2000, 1000, method=method)
+            self.assertFalse(myhk.fall_back)
+            self.assertFalse(myhk.un_conv)
+            self.assertTrue(np.isfinite(myhk.b))
+            self.assertTrue(np.isclose(myhk.piB(myhk.b - 1.), 0.95,
+                                       atol=1e-5))
+
 
 if __name__ == '__main__':
     unittest.main()
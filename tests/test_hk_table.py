@@ -0,0 +1,49 @@
+# -- coding: utf-8 --
+import numpy as np
+from toleranceinterval import _hk_table
+from toleranceinterval.hk import HansonKoopmans
+from toleranceinterval.oneside import hanson_koopmans
+import unittest
+
+
+class TestEverything(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(121)
+
+    def test_table_matches_solver(self):
+        for n, j in [(10, 9), (28, 11)]:
+            b, fall_back = _hk_table.lookup(0.1, 0.95, n, j)
+            myhk = HansonKoopmans(0.1, 0.95, n, j)
+            self.assertFalse(fall_back)
+            self.assertTrue(np.isclose(b, float(myhk.b)))
+
+    def test_table_reproducible(self):
+        # re-solve a few cells, they match the table within the solver tol
+        table = _hk_table.load_table()
+        solved = np.flatnonzero(~table['fall_back'])
+        for i in self.rng.choice(solved, 8, replace=False):
+            myhk = HansonKoopmans(table['ps'][i], table['gs'][i],
+                                  table['ns'][i], table['js'][i])
+            self.assertFalse(myhk.un_conv)
+            self.assertLessEqual(abs(float(myhk.b) - table['b'][i]), 1e-5)
+
+    def test_table_fall_back(self):
+        b, fall_back = _hk_table.lookup(0.1, 0.95, 100, 99)
+        self.assertTrue(fall_back)
+
+    def test_upper_uses_table(self):
+        # 1.0 - 0.9 != 0.1, but both should use the tabulated b factor
+        b, _ = _hk_table.lookup(0.1, 0.95, 10, 9)
+        x = np.sort(self.rng.random(10))
+        bound = hanson_koopmans(x, 0.9, 0.95)[0]
+        self.assertEqual(bound, x[0] + b*(x[-1] - x[0]))
+
+    def test_table_miss(self):
+        self.assertIsNone(_hk_table.lookup(0.25, 0.95, 10, 9))
+        self.assertIsNone(_hk_table.lookup(0.1, 0.95, 10, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
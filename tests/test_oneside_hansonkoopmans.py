@@ -4,6 +4,11 @@ from toleranceinterval.oneside import hanson_koopmans
 import unittest
 
 
+def _close(a, b, rtol=1e-05, atol=1e-08):
+    # scalar np.isclose(a, b, rtol, atol)
+    return abs(a - b) <= atol + rtol*abs(b)
+
+
 class TestEverything(unittest.TestCase):
 
     # Values from:
@@ -88,6 +93,10 @@ class TestEverything(unittest.TestCase):
                      [20, 0.05, 0.95, 10.68],
                      [20, 0.05, 0.99, 55.47]])
 
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(121)
+
     def test_upper_table_bounds(self):
         j = 1
         for i, row in enumerate(self.data):
@@ -95,11 +104,11 @@ class TestEverything(unittest.TestCase):
             p = 1.0-row[1]
             g = row[2]
             b = row[3]
-            x = np.random.random(n) + 1000.
+            x = self.rng.random(n) + 1000.
             x.sort()
             bound = hanson_koopmans(x, p, g, j=1)[0]
             b_ = (bound - x[n-j-1]) / (x[-1] - x[n-j-1])
-            self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+            self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
 
     def test_lower_table_bounds(self):
         j = 1
@@ -108,27 +117,24 @@ class TestEverything(unittest.TestCase):
             p = row[1]
             g = row[2]
             b = row[3]
-            x = np.random.random(n) + 1000.
+            x = self.rng.random(n) + 1000.
             x.sort()
             bound = hanson_koopmans(x, p, g, j=1)[0]
             b_ = (x[j] - bound) / (x[j] - x[0])
-            self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+            self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
 
     def test_random_shapes(self):
-        M = [3, 10, 20]
-        N = [5, 10, 20]
-        J = [1, 2]
-        for m in M:
-            for n in N:
-                for j in J:
-                    x = np.random.random((m, n))
-                    bounds = hanson_koopmans(x, 0.1, 0.95, j=j)
-                    _m = bounds.size
-                    self.assertTrue(_m == m)
+        # one stacked call per (n, j) covers every m at once
+        m = sum([3, 10, 20])
+        for n in [5, 10, 20]:
+            x = self.rng.random((m, n))
+            for j in [1, 2]:
+                bounds = hanson_koopmans(x, 0.1, 0.95, j=j)
+                self.assertEqual(bounds.shape, (m,))
 
     def test_value_error(self):
         with self.assertRaises(ValueError):
-            x = np.random.random((1, 2, 4, 3))
+            x = self.rng.random((1, 2, 4, 3))
             hanson_koopmans(x, 0.1, 0.9)
 
     def test_step_size(self):
@@ -139,11 +145,11 @@ class TestEverything(unittest.TestCase):
         p = row[1]
         g = row[2]
         b = row[3]
-        x = np.random.random(n)
+        x = self.rng.random(n)
         x.sort()
         bound = hanson_koopmans(x, p, g, step_size=1e-6)[0]
         b_ = (x[j] - bound) / (x[j] - x[0])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
 
     def test_new_raphson(self):
         i = 0
@@ -153,19 +159,19 @@ class TestEverything(unittest.TestCase):
         p = row[1]
         g = row[2]
         b = row[3]
-        x = np.random.random(n)
+        x = self.rng.random(n)
         x.sort()
         bound = hanson_koopmans(x, p, g, method='newton-raphson')[0]
         b_ = (x[j] - bound) / (x[j] - x[0])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
         bound = hanson_koopmans(x, p, g, method='newton-raphson',
                                 max_iter=50)[0]
         b_ = (x[j] - bound) / (x[j] - x[0])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
         bound = hanson_koopmans(x, p, g, method='newton-raphson',
                                 tol=1e-6)[0]
         b_ = (x[j] - bound) / (x[j] - x[0])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
 
     def test_halley(self):
         i = 0
@@ -175,28 +181,53 @@ class TestEverything(unittest.TestCase):
         p = row[1]
         g = row[2]
         b = row[3]
-        x = np.random.random(n)
+        x = self.rng.random(n)
         x.sort()
         bound = hanson_koopmans(x, p, g, method='halley')[0]
         b_ = (x[j] - bound) / (x[j] - x[0])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
         bound = hanson_koopmans(x, p, g, method='halley', max_iter=50)[0]
         b_ = (x[j] - bound) / (x[j] - x[0])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
         bound = hanson_koopmans(x, p, g, method='halley', tol=1e-6)[0]
         b_ = (x[j] - bound) / (x[j] - x[0])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
+
+    def test_brentq(self):
+        j = 1
+        for row in self.data[::10]:
+            n = int(row[0])
+            p = row[1]
+            g = row[2]
+            b = row[3]
+            x = self.rng.random(n)
+            x.sort()
+            bound = hanson_koopmans(x, p, g, j=j, method='brentq')[0]
+            b_ = (x[j] - bound) / (x[j] - x[0])
+            self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
+
+    def test_dtype(self):
+        x = self.rng.random((3, 10))
+        bound = hanson_koopmans(x.astype(np.float32), 0.1, 0.95)
+        self.assertEqual(bound.dtype, np.float32)
+        self.assertTrue(np.allclose(bound, hanson_koopmans(x, 0.1, 0.95),
+                                    rtol=1e-5))
+        bound = hanson_koopmans(np.arange(10), 0.1, 0.95)
+        self.assertEqual(bound.dtype, np.float64)
 
     def test_fall_back(self):
         p = 0.01
         g = 0.95
         n = 300
-        x = np.random.random(n)
+        x = self.rng.random(n)
         x.sort()
         bound = hanson_koopmans(x, p, g)[0]
-        self.assertTrue(np.isclose(bound, x[0]))
+        self.assertTrue(_close(bound, x[0]))
+        # 0-d p and g reach the non-parametric fall back too
+        x = x[:100]
+        bound = hanson_koopmans(x, np.array(0.1), np.array(0.95), j=99)
+        self.assertEqual(bound, hanson_koopmans(x, 0.1, 0.95, j=99))
 
 
 if __name__ == '__main__':
-    np.random.seed(121)
     unittest.main()
@@ -1,7 +1,15 @@
 # -- coding: utf-8 --
 import numpy as np
 from toleranceinterval.oneside import hanson_koopmans_cmh
+from toleranceinterval.oneside import hanson_koopmans_batch
+from toleranceinterval.oneside.oneside import _solve_b_cached
 import unittest
+from unittest import mock
+
+
+def _close(a, b, rtol=1e-05, atol=1e-08):
+    # scalar np.isclose(a, b, rtol, atol)
+    return abs(a - b) <= atol + rtol*abs(b)
 
 
 class TestEverything(unittest.TestCase):
@@ -37,17 +45,21 @@ class TestEverything(unittest.TestCase):
     n_range3 = [275]
     n_range = np.concatenate((n_range0, n_range1, n_range2, n_range3))
 
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(121)
+
     def test_b_basis(self):
         p = 0.1
         g = 0.95
         for i, b in enumerate(self.b_range):
             j = self.j_range[i]-1
             n = self.n_range_b[i]
-            x = np.random.random(n)
+            x = self.rng.random(n)
             x.sort()
             bound = hanson_koopmans_cmh(x, p, g, j=j)[0]
             b_ = np.log(bound / x[j]) / np.log(x[0]/x[j])
-            self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+            self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
 
     def test_a_basis(self):
         p = 0.01
@@ -55,34 +67,59 @@ class TestEverything(unittest.TestCase):
         for i, b in enumerate(self.a_range):
             n = self.n_range[i]
             j = n-1
-            x = np.random.random(n)
+            x = self.rng.random(n)
             x.sort()
             bound = hanson_koopmans_cmh(x, p, g)[0]
             b_ = np.log(bound / x[j]) / np.log(x[0]/x[j])
-            self.assertTrue(np.isclose(b, b_, rtol=1e-4, atol=1e-5))
+            self.assertTrue(_close(b, b_, rtol=1e-4, atol=1e-5))
+
+    def test_b_basis_batch(self):
+        p = 0.1
+        g = 0.95
+        xs = [np.sort(self.rng.random(n)) for n in self.n_range_b]
+        j = np.array(self.j_range) - 1
+        bounds = hanson_koopmans_batch(xs, p, g, j=j, cmh=True)
+        for i, b in enumerate(self.b_range):
+            x = xs[i]
+            b_ = np.log(bounds[i] / x[j[i]]) / np.log(x[0]/x[j[i]])
+            self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
+
+    def test_batch_matches_2d(self):
+        x = self.rng.random((4, 12))
+        bounds = hanson_koopmans_batch(list(x) + [x[0, :10]], 0.1, 0.95,
+                                       cmh=True)
+        self.assertTrue(np.allclose(bounds[:4],
+                                    hanson_koopmans_cmh(x, 0.1, 0.95)))
+        bound = hanson_koopmans_cmh(x[0, :10], 0.1, 0.95)[0]
+        self.assertTrue(_close(bounds[4], bound))
 
     def test_random_shapes(self):
-        M = [3, 10, 20]
-        N = [5, 10, 20]
-        J = [1, 2]
-        for m in M:
-            for n in N:
-                for j in J:
-                    x = np.random.random((m, n))
-                    bounds = hanson_koopmans_cmh(x, 0.1, 0.95, j=j)
-                    _m = bounds.size
-                    self.assertTrue(_m == m)
+        # one stacked call per (n, j) covers every m at once
+        m = sum([3, 10, 20])
+        for n in [5, 10, 20]:
+            x = self.rng.random((m, n))
+            for j in [1, 2]:
+                bounds = hanson_koopmans_cmh(x, 0.1, 0.95, j=j)
+                self.assertEqual(bounds.shape, (m,))
 
     def test_value_error_shape(self):
         with self.assertRaises(ValueError):
-            x = np.random.random((1, 2, 4, 3))
+            x = self.rng.random((1, 2, 4, 3))
             hanson_koopmans_cmh(x, 0.1, 0.9)
 
     def test_value_error_upper(self):
         with self.assertRaises(ValueError):
-            x = np.random.random((10, 10))
+            x = self.rng.random((10, 10))
             hanson_koopmans_cmh(x, 0.9, 0.95)
 
+    def _solve(self, *args, **kwargs):
+        # skip the precomputed table (and cached b) so that the solver and
+        # its options are exercised for the tabulated handbook cells
+        _solve_b_cached.cache_clear()
+        with mock.patch('toleranceinterval.oneside.oneside.lookup',
+                        return_value=None):
+            return hanson_koopmans_cmh(*args, **kwargs)
+
     def test_step_size(self):
         p = 0.1
         g = 0.95
@@ -90,11 +127,11 @@ class TestEverything(unittest.TestCase):
         b = self.b_range[i]
         j = self.j_range[i]-1
         n = self.n_range_b[i]
-        x = np.random.random(n)
+        x = self.rng.random(n)
         x.sort()
-        bound = hanson_koopmans_cmh(x, p, g, j=j, step_size=1e-5)[0]
+        bound = self._solve(x, p, g, j=j, step_size=1e-5)[0]
         b_ = np.log(bound / x[j]) / np.log(x[0]/x[j])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
 
     def test_new_raphson(self):
         p = 0.1
@@ -103,19 +140,19 @@ class TestEverything(unittest.TestCase):
         b = self.b_range[i]
         j = self.j_range[i]-1
         n = self.n_range_b[i]
-        x = np.random.random(n)
+        x = self.rng.random(n)
         x.sort()
-        bound = hanson_koopmans_cmh(x, p, g, j=j, method='newton-raphson')[0]
+        bound = self._solve(x, p, g, j=j, method='newton-raphson')[0]
         b_ = np.log(bound / x[j]) / np.log(x[0]/x[j])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
-        bound = hanson_koopmans_cmh(x, p, g, j=j, method='newton-raphson',
-                                    max_iter=50)[0]
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
+        bound = self._solve(x, p, g, j=j, method='newton-raphson',
+                            max_iter=50)[0]
         b_ = np.log(bound / x[j]) / np.log(x[0]/x[j])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
-        bound = hanson_koopmans_cmh(x, p, g, j=j, method='newton-raphson',
-                                    tol=1e-6)[0]
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
+        bound = self._solve(x, p, g, j=j, method='newton-raphson',
+                            tol=1e-6)[0]
         b_ = np.log(bound / x[j]) / np.log(x[0]/x[j])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
 
     def test_halley(self):
         p = 0.1
@@ -124,30 +161,29 @@ class TestEverything(unittest.TestCase):
         b = self.b_range[i]
         j = self.j_range[i]-1
         n = self.n_range_b[i]
-        x = np.random.random(n)
+        x = self.rng.random(n)
         x.sort()
-        bound = hanson_koopmans_cmh(x, p, g, j=j, method='halley')[0]
+        bound = self._solve(x, p, g, j=j, method='halley')[0]
         b_ = np.log(bound / x[j]) / np.log(x[0]/x[j])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
-        bound = hanson_koopmans_cmh(x, p, g, j=j, method='halley',
-                                    max_iter=50)[0]
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
+        bound = self._solve(x, p, g, j=j, method='halley',
+                            max_iter=50)[0]
         b_ = np.log(bound / x[j]) / np.log(x[0]/x[j])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
-        bound = hanson_koopmans_cmh(x, p, g, j=j, method='halley',
-                                    tol=1e-6)[0]
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
+        bound = self._solve(x, p, g, j=j, method='halley',
+                            tol=1e-6)[0]
         b_ = np.log(bound / x[j]) / np.log(x[0]/x[j])
-        self.assertTrue(np.isclose(b, b_, rtol=1e-3, atol=1e-4))
+        self.assertTrue(_close(b, b_, rtol=1e-3, atol=1e-4))
 
     def test_fall_back(self):
         p = 0.01
         g = 0.95
         n = 300
-        x = np.random.random(n)
+        x = self.rng.random(n)
         x.sort()
         bound = hanson_koopmans_cmh(x, p, g)[0]
-        self.assertTrue(np.isclose(bound, x[0]))
+        self.assertTrue(_close(bound, x[0]))
 
 
 if __name__ == '__main__':
-    np.random.seed(121)
     unittest.main()
@@ -3,8 +3,6 @@ import numpy as np
 from toleranceinterval.oneside import lognormal
 import unittest
 
-np.random.seed(1212)
-
 
 class TestEverything(unittest.TestCase):
 
@@ -59,48 +57,52 @@ class TestEverything(unittest.TestCase):
 
     K = K.reshape(sample_sizes.size, P.size)
 
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(121)
+        # one random sample per sample size, shared by the upper and lower
+        # bound tests
+        cls._fix = {}
+        for n in cls.sample_sizes:
+            x = cls.rng.random(n)
+            log_x = np.log(x)
+            cls._fix[n] = (x, log_x.mean(), log_x.std(ddof=1))
+
     def test_upper_montgomery_bounds(self):
-        for i, row in enumerate(self.K):
-            n = self.sample_sizes[i]
-            x = np.random.random(n)
-            xmu = np.mean(np.log(x))
-            xstd = np.std(np.log(x), ddof=1)
-            for j, k in enumerate(row):
+        k_hat = np.empty(self.K.shape)
+        for i, n in enumerate(self.sample_sizes):
+            x, xmu, xstd = self._fix[n]
+            for j in range(self.P.size):
                 p = self.P[j]
                 g = self.G[j]
                 bound = lognormal(x, p, g)
-                k_hat = (np.log(bound) - xmu)/xstd
-                self.assertTrue(np.isclose(k, k_hat[0], rtol=1e-3, atol=1e-4))
+                k_hat[i, j] = (np.log(bound[0]) - xmu)/xstd
+        np.testing.assert_allclose(k_hat, self.K, rtol=1e-3, atol=1e-4)
 
     def test_lower_montgomery_bounds(self):
-        for i, row in enumerate(self.K):
-            n = self.sample_sizes[i]
-            x = np.random.random(n)
-            xmu = np.mean(np.log(x))
-            xstd = np.std(np.log(x), ddof=1)
-            for j, k in enumerate(row):
+        k_hat = np.empty(self.K.shape)
+        for i, n in enumerate(self.sample_sizes):
+            x, xmu, xstd = self._fix[n]
+            for j in range(self.P.size):
                 p = 1.0 - self.P[j]
                 g = self.G[j]
                 bound = lognormal(x, p, g)
-                k_hat = (xmu - np.log(bound))/xstd
-                self.assertTrue(np.isclose(k, k_hat[0], rtol=1e-2, atol=1e-3))
+                k_hat[i, j] = (xmu - np.log(bound[0]))/xstd
+        np.testing.assert_allclose(k_hat, self.K, rtol=1e-2, atol=1e-3)
 
     def test_random_shapes(self):
-        M = [3, 10, 20]
-        N = [5, 10, 20]
-        for m in M:
-            for n in N:
-                x = np.random.random((m, n))
-                bounds = lognormal(x, 0.1, 0.95)
-                _m = bounds.size
-                self.assertTrue(_m == m)
+        # one stacked call per n covers every m at once
+        m = sum([3, 10, 20])
+        for n in [5, 10, 20]:
+            x = self.rng.random((m, n))
+            bounds = lognormal(x, 0.1, 0.95)
+            self.assertEqual(bounds.shape, (m,))
 
     def test_value_error(self):
         with self.assertRaises(ValueError):
-            x = np.random.random((1, 2, 4, 3))
+            x = self.rng.random((1, 2, 4, 3))
             lognormal(x, 0.1, 0.9)
 
 
 if __name__ == '__main__':
-    np.random.seed(121)
     unittest.main()
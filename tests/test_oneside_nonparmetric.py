@@ -37,49 +37,76 @@ class TestEverything(unittest.TestCase):
                   228, 219, 88, 85, 79, 41, 39, 35, 6, 5, 3]) - 1.
     K = K.reshape(sample_sizes.size, P.size)
 
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(121)
+
     def test_upper_table_bounds(self):
         for i, row in enumerate(self.K):
             n = self.sample_sizes[i]
-            x = np.arange(n)
-            for j, k in enumerate(row):
-                k = n - k - 1
-                p = self.P[j]
-                g = self.G[j]
-                bound = non_parametric(x, p, g)[0]
-                if np.isnan(k) and np.isnan(bound):
-                    self.assertTrue(True)
-                else:
-                    self.assertEqual(k, bound)
+            x = np.broadcast_to(np.arange(n), (self.P.size, n))
+            bounds = non_parametric(x, self.P, self.G)
+            # NaN rows are compared as equal by assert_array_equal
+            np.testing.assert_array_equal(bounds, n - row - 1)
+            # the scalar p and g API
+            for j in range(self.P.size):
+                bound = non_parametric(x[j], self.P[j], self.G[j])
+                np.testing.assert_array_equal(bound, n - row[j] - 1)
 
     def test_lower_table_bounds(self):
         for i, row in enumerate(self.K):
             n = self.sample_sizes[i]
-            x = np.arange(n)
-            for j, k in enumerate(row):
-                p = 1.0 - self.P[j]
-                g = self.G[j]
-                bound = non_parametric(x, p, g)[0]
-                if np.isnan(k) and np.isnan(bound):
-                    self.assertTrue(True)
-                else:
-                    self.assertEqual(k, bound)
+            x = np.broadcast_to(np.arange(n), (self.P.size, n))
+            bounds = non_parametric(x, 1.0 - self.P, self.G)
+            np.testing.assert_array_equal(bounds, row)
+            for j in range(self.P.size):
+                bound = non_parametric(x[j], 1.0 - self.P[j], self.G[j])
+                np.testing.assert_array_equal(bound, row[j])
+
+    def test_scalar_matches_vector(self):
+        for n in [10, 50, 300]:
+            x = self.rng.random((self.P.size, n))
+            for p in [self.P, 1.0 - self.P]:
+                bounds = non_parametric(x, p, self.G)
+                for j in range(self.P.size):
+                    bound = non_parametric(x[j], p[j], self.G[j])[0]
+                    if np.isnan(bound):
+                        self.assertTrue(np.isnan(bounds[j]))
+                    else:
+                        self.assertEqual(bound, bounds[j])
+
+    def test_scalar_types(self):
+        # 0-d arrays and numpy scalars give the same (cached) bound
+        x = self.rng.random((3, 100))
+        bound = non_parametric(x, 0.1, 0.95)
+        for p, g in [(np.array(0.1), np.array(0.95)),
+                     (np.float64(0.1), np.float64(0.95))]:
+            np.testing.assert_array_equal(non_parametric(x, p, g), bound)
 
     def test_random_shapes(self):
-        M = [3, 10, 20]
-        N = [5, 10, 20]
-        for m in M:
-            for n in N:
-                x = np.random.random((m, n))
-                bounds = non_parametric(x, 0.1, 0.95)
-                _m = bounds.size
-                self.assertTrue(_m == m)
+        # one stacked call per n covers every m at once
+        m = sum([3, 10, 20])
+        for n in [5, 10, 20]:
+            x = self.rng.random((m, n))
+            bounds = non_parametric(x, 0.1, 0.95)
+            self.assertEqual(bounds.shape, (m,))
+
+    def test_no_bound_warns(self):
+        # the scalar and per-row paths warn alike when a bound is missing
+        x = self.rng.random((2, 10))
+        with self.assertWarns(RuntimeWarning):
+            bound = non_parametric(x, 0.99, 0.99)
+        self.assertTrue(np.isnan(bound).all())
+        with self.assertWarns(RuntimeWarning):
+            bounds = non_parametric(x, np.array([0.25, 0.99]), 0.9)
+        self.assertFalse(np.isnan(bounds[0]))
+        self.assertTrue(np.isnan(bounds[1]))
 
     def test_value_error(self):
         with self.assertRaises(ValueError):
-            x = np.random.random((1, 2, 4, 3))
+            x = self.rng.random((1, 2, 4, 3))
             non_parametric(x, 0.1, 0.9)
 
 
 if __name__ == '__main__':
-    np.random.seed(121)
     unittest.main()
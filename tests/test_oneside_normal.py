@@ -57,58 +57,64 @@ class TestEverything(unittest.TestCase):
 
     K = K.reshape(sample_sizes.size, P.size)
 
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(121)
+        # one random sample per sample size, shared by the upper and lower
+        # bound tests
+        cls._fix = {}
+        for n in cls.sample_sizes:
+            x = cls.rng.random(n)
+            cls._fix[n] = (x, x.mean(), x.std(ddof=1))
+
     def test_upper_montgomery_bounds(self):
-        for i, row in enumerate(self.K):
-            n = self.sample_sizes[i]
-            x = np.random.random(n)
-            xmu = x.mean()
-            xstd = x.std(ddof=1)
-            for j, k in enumerate(row):
+        k_hat = np.empty(self.K.shape)
+        for i, n in enumerate(self.sample_sizes):
+            x, xmu, xstd = self._fix[n]
+            for j in range(self.P.size):
                 p = self.P[j]
                 g = self.G[j]
                 bound = normal(x, p, g)
-                k_hat = (bound - xmu)/xstd
-                self.assertTrue(np.isclose(k, k_hat[0], rtol=1e-3, atol=1e-4))
+                k_hat[i, j] = (bound[0] - xmu)/xstd
+        np.testing.assert_allclose(k_hat, self.K, rtol=1e-3, atol=1e-4)
 
     def test_lower_montgomery_bounds(self):
-        for i, row in enumerate(self.K):
-            n = self.sample_sizes[i]
-            x = np.random.random(n)
-            xmu = x.mean()
-            xstd = x.std(ddof=1)
-            for j, k in enumerate(row):
+        k_hat = np.empty(self.K.shape)
+        for i, n in enumerate(self.sample_sizes):
+            x, xmu, xstd = self._fix[n]
+            for j in range(self.P.size):
                 p = 1.0 - self.P[j]
                 g = self.G[j]
                 bound = normal(x, p, g)
-                k_hat = (xmu - bound)/xstd
-                self.assertTrue(np.isclose(k, k_hat[0], rtol=1e-3, atol=1e-4))
+                k_hat[i, j] = (xmu - bound[0])/xstd
+        np.testing.assert_allclose(k_hat, self.K, rtol=1e-3, atol=1e-4)
+
+    def _shapes_check(self, M, N, convert):
+        # one stacked call per n covers every m at once
+        m = sum(M)
+        for n in N:
+            x = self.rng.random((m, n))
+            bounds = normal(convert(x), 0.1, 0.95)
+            self.assertEqual(bounds.shape, (m,))
 
     def test_random_shapes(self):
-        M = [3, 10, 20]
-        N = [5, 10, 20]
-        for m in M:
-            for n in N:
-                x = np.random.random((m, n))
-                bounds = normal(x, 0.1, 0.95)
-                _m = bounds.size
-                self.assertTrue(_m == m)
+        self._shapes_check([3, 10, 20], [5, 10, 20], np.asarray)
 
     def test_value_error(self):
         with self.assertRaises(ValueError):
-            x = np.random.random((1, 2, 4, 3))
+            x = self.rng.random((1, 2, 4, 3))
             normal(x, 0.1, 0.9)
 
     def test_lists(self):
-        M = [3, 5]
-        N = [5, 7]
-        for m in M:
-            for n in N:
-                x = np.random.random((m, n))
-                bounds = normal(list(x), 0.1, 0.95)
-                _m = bounds.size
-                self.assertTrue(_m == m)
+        # nested Python lists, as a user would pass them
+        self._shapes_check([3, 5], [5, 7], lambda a: a.tolist())
+
+    def test_float32(self):
+        x = self.rng.random((3, 10))
+        bounds = normal(x.astype(np.float32), 0.1, 0.95)
+        self.assertEqual(bounds.dtype, np.float32)
+        self.assertTrue(np.allclose(bounds, normal(x, 0.1, 0.95), rtol=1e-5))
 
 
 if __name__ == '__main__':
-    np.random.seed(121)
     unittest.main()
@@ -7,19 +7,25 @@ import unittest
 
 class TestEverything(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(121)
+
     def _run_test_cases(self, N, P, G, K, method):
-        for i, k in enumerate(K):
-            n = N[i]
-            x = np.random.random(n) * 10
-            xmu = np.mean(np.log(x))
-            xstd = np.std(np.log(x), ddof=1)
-            p = P[i]
-            g = G[i]
-            bound = lognormal(x, p, g, method=method)
-            k_hat_l = (xmu - np.log(bound[0, 0])) / xstd
-            k_hat_u = (np.log(bound[0, 1]) - xmu) / xstd
-            self.assertTrue(np.isclose(k, k_hat_l, rtol=1e-4, atol=1e-5))
-            self.assertTrue(np.isclose(k, k_hat_u, rtol=1e-4, atol=1e-5))
+        # the sample sizes differ, so each case is its own call
+        xmu = np.empty(len(K))
+        xstd = np.empty(len(K))
+        bound = np.empty((len(K), 2))
+        for i, n in enumerate(N):
+            x = self.rng.random(n) * 10
+            lx = np.log(x)
+            xmu[i] = lx.mean()
+            xstd[i] = lx.std(ddof=1)
+            bound[i] = lognormal(x, P[i], G[i], method=method)[0]
+        k_hat_l = (xmu - np.log(bound[:, 0])) / xstd
+        k_hat_u = (np.log(bound[:, 1]) - xmu) / xstd
+        np.testing.assert_allclose(k_hat_l, K, rtol=1e-4, atol=1e-5)
+        np.testing.assert_allclose(k_hat_u, K, rtol=1e-4, atol=1e-5)
 
     def test_exact(self):
         # We test only one case here mostly as a sanity check to make sure
@@ -55,21 +61,18 @@ class TestEverything(unittest.TestCase):
         self._run_test_cases(N, P, G, K, 'howe')
 
     def test_random_shapes(self):
-        M = [3, 10, 20]
-        N = [5, 10, 20]
-        for m in M:
-            for n in N:
-                x = np.random.random((m, n))
-                bounds = lognormal(x, 0.95, 0.95)
-                _m, _ = bounds.shape
-                self.assertTrue(_m == m)
+        # one stacked call per n covers every m at once
+        m = sum([3, 10, 20])
+        for n in [5, 10, 20]:
+            x = self.rng.random((m, n))
+            bounds = lognormal(x, 0.95, 0.95)
+            self.assertEqual(bounds.shape, (m, 2))
 
     def test_value_error(self):
         with self.assertRaises(ValueError):
-            x = np.random.random((1, 2, 4, 3))
+            x = self.rng.random((1, 2, 4, 3))
             lognormal(x, 0.9, 0.9)
 
 
 if __name__ == '__main__':
-    np.random.seed(121)
     unittest.main()
@@ -1,25 +1,30 @@
 # -- coding: utf-8 --
 import numpy as np
-from toleranceinterval.twoside import normal
+from toleranceinterval.twoside import normal, normal_factor
 # from scipy.stats import chi2
 import unittest
 
 
 class TestEverything(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(121)
+
     def _run_test_cases(self, N, P, G, K, method):
-        for i, k in enumerate(K):
-            n = N[i]
-            x = np.random.random(n) * 10
-            xmu = x.mean()
-            xstd = x.std(ddof=1)
-            p = P[i]
-            g = G[i]
-            bound = normal(x, p, g, method=method)
-            k_hat_l = (xmu - bound[0, 0]) / xstd
-            k_hat_u = (bound[0, 1] - xmu) / xstd
-            self.assertTrue(np.isclose(k, k_hat_l, rtol=1e-4, atol=1e-5))
-            self.assertTrue(np.isclose(k, k_hat_u, rtol=1e-4, atol=1e-5))
+        # the sample sizes differ, so each case is its own call
+        xmu = np.empty(len(K))
+        xstd = np.empty(len(K))
+        bound = np.empty((len(K), 2))
+        for i, n in enumerate(N):
+            x = self.rng.random(n) * 10
+            xmu[i] = x.mean()
+            xstd[i] = x.std(ddof=1)
+            bound[i] = normal(x, P[i], G[i], method=method)[0]
+        k_hat_l = (xmu - bound[:, 0]) / xstd
+        k_hat_u = (bound[:, 1] - xmu) / xstd
+        np.testing.assert_allclose(k_hat_l, K, rtol=1e-4, atol=1e-5)
+        np.testing.assert_allclose(k_hat_u, K, rtol=1e-4, atol=1e-5)
 
     def test_exact(self):
         # We test only one case here mostly as a sanity check to make sure
@@ -55,21 +60,70 @@ class TestEverything(unittest.TestCase):
         self._run_test_cases(N, P, G, K, 'howe')
 
     def test_random_shapes(self):
-        M = [3, 10, 20]
-        N = [5, 10, 20]
-        for m in M:
-            for n in N:
-                x = np.random.random((m, n))
-                bounds = normal(x, 0.95, 0.95)
-                _m, _ = bounds.shape
-                self.assertTrue(_m == m)
+        # one stacked call per n covers every m at once
+        m = sum([3, 10, 20])
+        for n in [5, 10, 20]:
+            x = self.rng.random((m, n))
+            bounds = normal(x, 0.95, 0.95)
+            self.assertEqual(bounds.shape, (m, 2))
 
     def test_value_error(self):
         with self.assertRaises(ValueError):
-            x = np.random.random((1, 2, 4, 3))
+            x = self.rng.random((1, 2, 4, 3))
             normal(x, 0.9, 0.9)
 
+    def test_infinite_sample_size(self):
+        # every method reduces to the normal quantile for n = inf
+        for method in ['exact', 'howe', 'guenther']:
+            k = normal_factor(np.inf, 0.9, 0.95, method=method)
+            self.assertAlmostEqual(k, 1.6448536269514722, places=12)
+
+    def test_approx_array_sample_size(self):
+        # one call over a table of sample sizes matches the scalar calls
+        n = np.array([2, 5, 10, 100, np.inf])
+        for method in ['howe', 'guenther']:
+            k = normal_factor(n, 0.9, 0.95, method=method)
+            self.assertEqual(k.shape, n.shape)
+            for i in range(n.size):
+                self.assertEqual(k[i], normal_factor(n[i], 0.9, 0.95,
+                                                     method=method))
+
+    def test_scalar_types(self):
+        # Python, numpy, and 0-d array scalars give the same (cached) factor
+        k = normal_factor(30, 0.9, 0.95)
+        for n in [30.0, np.int64(30), np.array(30)]:
+            self.assertEqual(normal_factor(n, 0.9, 0.95), k)
+
+    def test_tailprob(self):
+        # tail probabilities give the same factor, and stay finite for tails
+        # that round 1 - tail to 1
+        for method in ['exact', 'howe', 'guenther']:
+            k = normal_factor(10, 0.9, 0.95, method=method)
+            k_tail = normal_factor(10, 0.1, 0.05, method=method,
+                                   tailprob=True)
+            self.assertAlmostEqual(k_tail, k, places=10)
+        for method in ['howe', 'guenther']:
+            k = normal_factor(10, 1e-18, 1e-18, method=method, tailprob=True)
+            self.assertTrue(np.isfinite(k))
+
+    def test_float32(self):
+        x = self.rng.random((3, 10))
+        for method in ['exact', 'howe', 'guenther']:
+            bound = normal(x.astype(np.float32), 0.9, 0.95, method=method)
+            self.assertEqual(bound.dtype, np.float32)
+            self.assertTrue(np.allclose(bound, normal(x, 0.9, 0.95,
+                                                      method=method),
+                                        rtol=1e-5))
+
+    def test_chi2_ppf(self):
+        # the chi-square quantile matches scipy.stats, also for tiny tails
+        from scipy.stats import chi2
+        from toleranceinterval.twoside._normal_exact import _chi2_ppf
+        for nu in [1, 4, 9, 99, 1e5]:
+            for q in [1e-15, 1e-6, 0.05, 0.5, 0.95]:
+                self.assertAlmostEqual(_chi2_ppf(q, nu) / chi2.ppf(q, nu),
+                                       1.0, places=12)
+
 
 if __name__ == '__main__':
-    np.random.seed(121)
     unittest.main()
@@ -22,15 +22,22 @@ class BaseTestMHE:
 
     class TestMeekerHahnEscobarJ5(unittest.TestCase):
 
+        def __init_subclass__(cls, **kwargs):
+            super().__init_subclass__(**kwargs)
+            # tables are declared flat, one row per sample size
+            cls.factor_g = cls.factor_g.reshape(cls.sample_size.size, -1)
+            # the reference tables are read-only, a stray in-place op raises
+            for name in ('coverage', 'confidence', 'sample_size', 'factor_g'):
+                getattr(cls, name).setflags(write=False)
+
         def test_tolerance_factor(self):
-            for row_idx, row in enumerate(self.factor_g):
-                for col_idx, g in enumerate(row):
-                    k = ts.normal_factor(
-                        self.sample_size[row_idx],
-                        self.coverage[col_idx],
-                        self.confidence[col_idx],
-                        method='exact')
-                    self.assertAlmostEqual(k, g, places=3)
+            # one broadcast call, columns pair coverage with confidence
+            k = ts.normal_factor(
+                self.sample_size[:, np.newaxis],
+                self.coverage,
+                self.confidence,
+                method='exact')
+            np.testing.assert_allclose(k, self.factor_g, rtol=0, atol=5e-4)
 
 
 class TestMeekerHahnEscobarJ5a(BaseTestMHE.TestMeekerHahnEscobarJ5):
@@ -172,8 +179,6 @@ class TestMeekerHahnEscobarJ5a(BaseTestMHE.TestMeekerHahnEscobarJ5):
         1.036, 1.036, 1.282, 1.282, 1.282, 1.282, 1.282,
     ])
 
-    factor_g = factor_g.reshape(sample_size.size, coverage.size)
-
 
 class TestMeekerHahnEscobarJ5b(BaseTestMHE.TestMeekerHahnEscobarJ5):
 
@@ -313,5 +318,3 @@ class TestMeekerHahnEscobarJ5b(BaseTestMHE.TestMeekerHahnEscobarJ5):
         1.645, 1.645, 1.645, 1.645, 1.645, 1.960, 1.960, 1.960, 1.960,
         1.960, 2.576, 2.576, 2.576, 2.576, 2.576,
     ])
-
-    factor_g = factor_g.reshape(sample_size.size, coverage.size)
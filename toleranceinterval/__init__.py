@@ -6,4 +6,10 @@ import os as _os  # noqa F401
 
 # add rudimentary version tracking
 __VERSION_FILE__ = _os.path.join(_os.path.dirname(__file__), 'VERSION')
-__version__ = open(__VERSION_FILE__).read().strip()
+try:
+    # use the installed package metadata to avoid reading the VERSION file
+    from importlib.metadata import version as _version
+    __version__ = _version('toleranceinterval')
+except Exception:
+    with open(__VERSION_FILE__) as _f:
+        __version__ = _f.read().strip()
@@ -0,0 +1,128 @@
+# -- coding: utf-8 --
+# MIT License
+#
+# Copyright (c) 2019 Charles Jekel
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+r"""
+Precomputed Hanson-Koopmans b factors for the standard A-basis and B-basis
+cells.
+
+The table is stored as hk_table.npz next to this file with the arrays ns, ps,
+gs, js, b, and fall_back. Regenerate it with
+
+    python -m toleranceinterval._hk_table
+
+"""
+
+import os
+import numpy as np
+
+TABLE_FILE = os.path.join(os.path.dirname(__file__), 'hk_table.npz')
+
+# A-basis and B-basis (p, g) cells
+A_BASIS = (0.01, 0.95)
+B_BASIS = (0.10, 0.95)
+
+# sample sizes tabulated in the Composite Materials Handbook
+N_RANGE = np.concatenate((np.arange(2, 51), np.arange(52, 102, 2),
+                          np.arange(105, 255, 5), [275]))
+N_RANGE_B = np.arange(2, 29)
+J_RANGE_B = np.array([2, 3, 4, 4, 5, 5, 6, 6, 6, 7, 7, 7, 8, 8, 8, 8, 9, 9,
+                      10, 10, 10, 11, 11, 11, 11, 11, 12]) - 1
+
+_table = None
+
+
+def load_table():
+    global _table
+    if _table is None:
+        with np.load(TABLE_FILE) as data:
+            _table = {key: data[key] for key in data.files}
+    return _table
+
+
+def lookup(p, g, n, j):
+    r"""
+    Look up a precomputed Hanson-Koopmans b factor.
+
+    Parameters
+    ----------
+    p : float
+        Percentile where p < 0.5 and p > 0.
+    g : float
+        Confidence level where g > 0. and g < 1.
+    n : int
+        Number of samples.
+    j : int
+        Index of the second value to use for the second order statistic.
+
+    Returns
+    -------
+    tuple or None
+        (b, fall_back) if the cell is tabulated, otherwise None.
+
+    """
+    table = load_table()
+    index = np.flatnonzero((table['ns'] == n) & (table['ps'] == p) &
+                           (table['gs'] == g) & (table['js'] == j))
+    if index.size == 0:
+        return None
+    i = index[0]
+    return float(table['b'][i]), bool(table['fall_back'][i])
+
+
+def build(fname=TABLE_FILE):
+    r"""
+    Solve and save the b factor table for the standard cells.
+
+    Parameters
+    ----------
+    fname : string, optional
+        Output .npz file. Default is the packaged hk_table.npz.
+
+    """
+    from .hk import HansonKoopmans
+    # flat (structure of arrays) parameter table, j = n-1 for the A-basis
+    # and B-basis cells, plus the handbook j values for the B-basis
+    extra = J_RANGE_B != N_RANGE_B - 1
+    N = N_RANGE.size
+    ns = np.concatenate((N_RANGE, N_RANGE, N_RANGE_B[extra]))
+    js = np.concatenate((N_RANGE - 1, N_RANGE - 1, J_RANGE_B[extra]))
+    ps = np.repeat([A_BASIS[0], B_BASIS[0], B_BASIS[0]],
+                   [N, N, extra.sum()])
+    gs = np.repeat([A_BASIS[1], B_BASIS[1], B_BASIS[1]],
+                   [N, N, extra.sum()])
+    b = np.full(ns.size, np.nan)
+    fall_back = np.zeros(ns.size, dtype=bool)
+    converged = np.ones(ns.size, dtype=bool)
+    for i in range(ns.size):
+        myhk = HansonKoopmans(ps[i], gs[i], ns[i], js[i])
+        fall_back[i] = myhk.fall_back
+        if not myhk.fall_back:
+            b[i] = float(myhk.b)
+            converged[i] = not myhk.un_conv
+    np.savez(fname, ns=ns[converged], ps=ps[converged], gs=gs[converged],
+             js=js[converged], b=b[converged],
+             fall_back=fall_back[converged])
+
+
+if __name__ == '__main__':
+    build()
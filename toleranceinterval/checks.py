@@ -25,17 +25,58 @@ import numpy as np
 
 
 def numpy_array(x):
-    if isinstance(x, np.ndarray) is False:
-        x = np.array(x)
-    return x
+    # ndarrays are returned as is, anything else is converted
+    return np.asarray(x)
 
 
-def assert_2d_sort(x):
-    if x.ndim == 1:
-        x = x.reshape(1, -1)
-    elif x.ndim > 2:
+def float_dtype(x):
+    # floating point input keeps its precision, anything else uses float64
+    if np.issubdtype(x.dtype, np.floating):
+        return x.dtype
+    return np.dtype(np.float64)
+
+
+def mean_std(x, overwrite_x=False):
+    # row mean and sample standard deviation (ddof=1) of a 2-D array, the
+    # deviations are formed in a single buffer instead of the two passes and
+    # temporaries of x.mean() followed by x.std(), and einsum sums their
+    # squares without squaring the buffer first
+    n = x.shape[1]
+    if x.dtype == np.float64 or x.dtype == np.float32:
+        # the same pairwise sum as x.mean() without its Python-level
+        # overhead, which dominates for short rows
+        mean = np.add.reduce(x, axis=1)
+        mean /= n
+    else:
+        mean = x.mean(axis=1)
+    if overwrite_x and x.dtype == mean.dtype:
+        # x is a scratch array owned by the caller, reuse it for the
+        # deviations
+        dev = np.subtract(x, mean[:, np.newaxis], out=x)
+    else:
+        dev = np.subtract(x, mean[:, np.newaxis], dtype=mean.dtype)
+    std = np.sqrt(np.einsum('ij,ij->i', dev, dev) / (n - 1))
+    return mean, std
+
+
+def assert_2d(x):
+    if x.ndim > 2:
         raise ValueError('x can not be more than 2 dimensions')
-    # Prevent modifications to input data by copying x before sorting.
-    x = x.copy()
-    x.sort()
-    return x
+    return np.atleast_2d(x)
+
+
+def assert_2d_sort(x):
+    # np.sort returns a sorted copy, so the input data is not modified.
+    return np.sort(assert_2d(x), axis=-1)
+
+
+def assert_2d_partition(x, kth):
+    # Only the order statistics in kth are in their sorted position. Like
+    # np.sort, np.partition returns a copy.
+    x = assert_2d(x)
+    n = x.shape[-1]
+    if np.ndim(kth) and len(kth) > 1 and any(0 < k % n < n - 1 for k in kth):
+        # np.partition runs one selection pass per kth, for several interior
+        # kth a full (vectorized) row sort is faster
+        return np.sort(x, axis=-1)
+    return np.partition(x, kth, axis=-1)
@@ -21,12 +21,69 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from sympy import Symbol, Integral, factorial
-from sympy import gamma, hyper, exp_polar, I, pi, log
-from scipy.special import betainc, betaincinv
+from functools import lru_cache
+from scipy.special import betainc, betaincinv, betaln
+from scipy.optimize import brentq, newton
 import numpy as np
+from numpy.polynomial.legendre import leggauss
+from math import isnan, log
 from warnings import warn
 
+# Gauss-Legendre quadrature for the right integral over [p, 1]. The
+# integrands sharpen towards v = 1 as n grows, so the number of nodes grows
+# with sqrt(n); 64 nodes are enough for n <= 64.
+GL_MIN_NODES = 64
+
+
+@lru_cache(maxsize=32)
+def _leggauss(n):
+    # nodes and weights on [-1, 1] for an n-point rule
+    nodes = max(GL_MIN_NODES, 8*int(np.ceil(np.sqrt(n))))
+    x, w = leggauss(nodes)
+    # the arrays are shared by every solve with the same node count
+    x.setflags(write=False)
+    w.setflags(write=False)
+    return x, w
+
+
+def vangel_approx(n, i, j, p, g):
+    r"""
+    Vangel's approximation of the Hanson-Koopmans b factor.
+
+    Every argument may be an array, they are broadcast together by the SciPy
+    special functions so a sweep over (n, j, p, g) is a single call.
+
+    Parameters
+    ----------
+    n : int or array_like
+        Number of samples.
+    i : int or array_like
+        Order (1-based) of the first order statistic.
+    j : int or array_like
+        Order (1-based) of the second order statistic.
+    p : float or array_like
+        Percentile where p < 0.5 and p > 0.
+    g : float or array_like
+        Confidence level where g > 0. and g < 1.
+
+    Returns
+    -------
+    float or ndarray
+        The approximate b factor.
+
+    References
+    ----------
+    [1] Vangel, M. G. (1994). One-sided nonparametric tolerance limits.
+        Communications in Statistics - Simulation and Computation, 23(4),
+        1137–1154. https://doi.org/10.1080/03610919408813222
+
+    """
+    betatmp = betainc(j, n-j+1, p)
+    a = g - betatmp
+    b = 1.0 - betatmp
+    q = betaincinv(i, j-i, a/b)
+    return np.log(((p)*(n+1))/j) / np.log(q)
+
 
 class HansonKoopmans(object):
 
@@ -53,13 +110,15 @@ class HansonKoopmans(object):
         method : string, optional
             Which rootfinding method to use to solve for the Hanson-Koopmans
             bound. Default is method='secant' which appears to converge
-            quickly. Other choices include 'newton-raphson' and 'halley'.
+            quickly. Other choices include 'newton-raphson', 'halley', and
+            'brentq', which brackets the root before using Brent's method.
         max_iter : int, optional
             Maximum number of iterations for the root finding method.
         tol : float, optional
             Tolerance for the root finding method to converge.
         step_size : float, optional
-            Step size for the secant solver. Default step_size = 1e-4.
+            Step size for the first finite difference slope of the secant
+            solver. Default step_size = 1e-4.
 
         Attributes
         ----------
@@ -91,8 +150,6 @@ class HansonKoopmans(object):
         self.max_iter = max_iter
         self.tol = tol
         self.step_size = step_size
-        # create a dummy variable v
-        self.v = Symbol('v', nonzero=True, rational=True, positive=True)
         # check that p, g, n, j are valid
         if not (p < 0.5 and p > 0.):
             self.invalid_value(p, 'p')
@@ -117,9 +174,9 @@ class HansonKoopmans(object):
             # raise RunTimeWarning?
         else:
             self.fall_back = False
-            b_guess = self.vangel_approx(p=float(self.p))
-            # print(float(b_guess))
-            if np.isnan(b_guess):
+            b_guess = float(self.vangel_approx(p=float(self.p)))
+            # print(b_guess)
+            if isnan(b_guess):
                 raise RuntimeError('Bad Vangel Approximation is np.nan')
             elif b_guess <= 0:
                 b_guess = 1e-2
@@ -131,6 +188,8 @@ class HansonKoopmans(object):
                 B, status, count = self.nr_solver(b_guess - 1.)
             elif method == 'halley':
                 B, status, count = self.halley_solver(b_guess - 1.)
+            elif method == 'brentq':
+                B, status, count = self.brentq_solver(b_guess - 1.)
             else:
                 raise ValueError(str(method) + ' is not a valid method!')
 
@@ -148,53 +207,58 @@ class HansonKoopmans(object):
 
     def constant_vales(self):
         self.nj = self.n-self.j-1
-        self.A = factorial(self.n) / (factorial(self.nj) *
-                                      factorial(self.j-1))
-        # compute the left integral
-        int_left = (self.p*self.p**self.j*gamma(self.j + 1) *
-                    hyper((-self.nj, self.j + 1),
-                          (self.j + 2,),
-                          self.p*exp_polar(2*I*pi)) /
-                    (self.j*gamma(self.j + 2)))
-        self.int_left = int_left.evalf()  # evaluates to double precision
+        # A = n!/(nj!*(j-1)!) = n/beta(j, nj+1) overflows a double for large
+        # n, so it is only used in log space, folded into the node weights
+        log_A = log(self.n) - betaln(self.j, self.nj + 1)
+        # the left integral, A*int_0^p v**j*(1-v)**nj/j dv, is an incomplete
+        # beta function
+        self.int_left = betainc(self.j + 1, self.nj + 1, self.p)
+        self.log_p = log(self.p)
+        # Gauss-Legendre rule for the right integral over [p, 1], the parts
+        # of the integrands that do not depend on B are computed once
+        x, w = _leggauss(self.n)
+        half = 0.5*(1.0 - self.p)
+        self.v = half*(x + 1.0) + self.p
+        self.L = np.log(self.v) - self.log_p
+        # A*(1-v)**nj*v**(j-1) is a scaled beta density and stays finite
+        self.w_v_j1 = np.exp(log_A + np.log(half*w) +
+                             self.nj*np.log1p(-self.v) +
+                             (self.j - 1)*np.log(self.v))
+        self.w_v_j = self.w_v_j1*self.v
+
+    def pv(self, B):
+        # p**(1/(B + 1))*v**(B/(B + 1)) at the quadrature nodes
+        return self.v*np.exp(-self.L/(B + 1.0))
+
+    def q(self, B):
+        # (v - pv)/v = 1 - exp(-L/(B + 1)), the powers of v are folded into
+        # the weights
+        q = np.expm1(self.L*(-1.0/(B + 1.0)))
+        return np.negative(q, out=q)
 
     def piB(self, B):
-        int_right_exp = (self.v**self.j*(1 - self.v)**self.nj/self.j
-                         - (1 - self.v)**self.nj*(-self.p**(1/(B + 1)) *
-                         self.v**(B/(B + 1)) + self.v)**self.j/self.j)
-        int_right = Integral(int_right_exp, (self.v, self.p, 1)).evalf()
-        return (self.int_left + int_right)*self.A
+        # only one expm1 and one integer power are left at each node
+        q = self.q(B)
+        np.power(q, self.j, out=q)
+        np.subtract(1.0, q, out=q)
+        int_right = np.dot(self.w_v_j, q)
+        return self.int_left + int_right/self.j
 
     def dpiB(self, B):
-        d_int_right_exp_B = (self.v**self.j*(1 - self.v)**self.nj/self.j -
-                             (1 - self.v)**self.nj*(-self.p**(1/(B + 1)) *
-                             self.v**(B/(B + 1))*(-B/(B + 1)**2 + 1/(B + 1)) *
-                             log(self.v) + self.p**(1/(B + 1))*self.v **
-                             (B / (B + 1))*log(self.p)/(B + 1)**2 + self.v) **
-                             self.j / self.j)
-        d_int_right = Integral(d_int_right_exp_B, (self.v, self.p, 1)).evalf()
-        return d_int_right*self.A
+        # d pv/dB = pv*L/(B + 1)**2
+        c = 1.0/(B + 1.0)
+        dpv = self.pv(B)*self.L*c*c
+        return np.dot(self.w_v_j1, self.q(B)**(self.j - 1)*dpv)
 
     def d2piB2(self, B):
-        d2_int_r_B = (-(1 - self.v)**self.nj*(-self.p**(1/(B + 1))*self.v **
-                      (B/(B + 1))*(-B/(B + 1)**2 + 1/(B + 1))*log(self.v) +
-                      self.p**(1/(B + 1))*self.v**(B/(B + 1))*log(self.p) /
-                      (B + 1)**2 + self.v)**self.j*(-self.p**(1/(B + 1)) *
-                      self.v**(B/(B + 1))*(2*B/(B + 1)**3 - 2/(B + 1)**2) *
-                      log(self.v) - self.p**(1/(B + 1))*self.v**(B/(B + 1)) *
-                      (-B/(B + 1)**2 + 1/(B + 1))**2*log(self.v)**2 + 2 *
-                      self.p**(1/(B + 1))*self.v**(B/(B + 1)) *
-                      (-B/(B + 1)**2 + 1/(B + 1))
-                      * log(self.p)*log(self.v)/(B + 1)**2 - 2 *
-                      self.p**(1/(B + 1))*self.v**(B/(B + 1))*log(self.p) /
-                      (B + 1)**3 - self.p**(1/(B + 1))*self.v**(B/(B + 1)) *
-                      log(self.p)**2/(B + 1)**4)/(-self.p**(1/(B + 1)) *
-                      self.v**(B/(B + 1))*(-B/(B + 1)**2 + 1/(B + 1)) *
-                      log(self.v) + self.p**(1/(B + 1))*self.v **
-                      (B/(B + 1)) *
-                      log(self.p)/(B + 1)**2 + self.v))
-        d2_int_right = Integral(d2_int_r_B, (self.v, self.p, 1)).evalf()
-        return d2_int_right*self.A
+        c = 1.0/(B + 1.0)
+        L = self.L
+        pv = self.pv(B)
+        q = self.q(B)
+        dpv = pv*L*c*c
+        d2pv = pv*L*c**3*(L*c - 2.0)
+        return np.dot(self.w_v_j1, q**(self.j - 1)*d2pv -
+                      (self.j - 1)*q**(self.j - 2)*dpv*dpv/self.v)
 
     def vangel_approx(self, n=None, i=None, j=None, p=None, g=None):
         if n is None:
@@ -207,11 +271,7 @@ class HansonKoopmans(object):
             p = self.p
         if g is None:
             g = self.g
-        betatmp = betainc(j, n-j+1, p)
-        a = g - betatmp
-        b = 1.0 - betatmp
-        q = betaincinv(i, j-i, a/b)
-        return np.log(((p)*(n+1))/j) / np.log(q)
+        return vangel_approx(n, i, j, p, g)
 
     def secant_solver(self, B_guess, max_iter=None, tol=None, step_size=None):
         if max_iter is None:
@@ -221,57 +281,72 @@ class HansonKoopmans(object):
         if step_size is None:
             step_size = self.step_size
         count = 0
-        f = self.piB(B_guess) - self.g
-        f1 = self.piB(B_guess + step_size) - self.g
-        dfdx = (f1 - f) / step_size
-        B_next = B_guess - (f/dfdx)
-        un_conv = np.abs(B_next - B_guess) > tol
-        while un_conv and count < max_iter:
-            B_guess = B_next
+        # the first slope is a finite difference with step_size, after that
+        # the last two iterates are reused so each iteration needs only one
+        # new evaluation of pi(B)
+        B_prev = B_guess
+        f_prev = self.piB(B_prev) - self.g
+        B_guess = B_prev + step_size
+        while True:
             f = self.piB(B_guess) - self.g
-            f1 = self.piB(B_guess + step_size) - self.g
-            dfdx = (f1 - f) / step_size
-            B_next = B_guess - (f/dfdx)
+            if f == 0.:
+                # B_guess is the root
+                return B_guess, False, count
+            if f == f_prev:
+                # flat secant, B_guess can not be improved, it has converged
+                # if the last step was within tol
+                return B_guess, np.abs(B_guess - B_prev) > tol, count
+            B_next = B_guess - f*(B_guess - B_prev)/(f - f_prev)
             un_conv = np.abs(B_next - B_guess) > tol
+            if not un_conv or count == max_iter:
+                return B_next, un_conv, count
+            B_prev, f_prev = B_guess, f
+            B_guess = B_next
             count += 1
-        return B_next, un_conv, count
+
+    def pi_minus_g(self, B):
+        return self.piB(B) - self.g
 
     def nr_solver(self, B_guess, max_iter=None, tol=None):
         if max_iter is None:
             max_iter = self.max_iter
         if tol is None:
             tol = self.tol
-        count = 0
-        f = self.piB(B_guess) - self.g
-        dfdx = self.dpiB(B_guess)
-        B_next = B_guess - (f/dfdx)
-        un_conv = np.abs(B_next - B_guess) > tol
-        while un_conv and count < max_iter:
-            B_guess = B_next
-            f = self.piB(B_guess) - self.g
-            dfdx = self.dpiB(B_guess)
-            B_next = B_guess - (f/dfdx)
-            un_conv = np.abs(B_next - B_guess) > tol
-            count += 1
-        return B_next, un_conv, count
+        B_next, res = newton(self.pi_minus_g, B_guess, fprime=self.dpiB,
+                             tol=tol, maxiter=max_iter, full_output=True,
+                             disp=False)
+        return B_next, not res.converged, res.iterations
 
     def halley_solver(self, B_guess, max_iter=None, tol=None):
         if max_iter is None:
             max_iter = self.max_iter
         if tol is None:
             tol = self.tol
+        B_next, res = newton(self.pi_minus_g, B_guess, fprime=self.dpiB,
+                             fprime2=self.d2piB2, tol=tol, maxiter=max_iter,
+                             full_output=True, disp=False)
+        return B_next, not res.converged, res.iterations
+
+    def brentq_solver(self, B_guess, max_iter=None, tol=None):
+        if max_iter is None:
+            max_iter = self.max_iter
+        if tol is None:
+            tol = self.tol
+        # pi(B) < g at B = 0, otherwise we fall back, so bracket the root by
+        # doubling the upper end starting from the Vangel approximation
         count = 0
-        f = self.piB(B_guess) - self.g
-        dfdx = self.dpiB(B_guess)
-        d2fdx2 = self.d2piB2(B_guess)
-        B_next = B_guess - ((2*f*dfdx) / (2*(dfdx**2) - (f*d2fdx2)))
-        un_conv = np.abs(B_next - B_guess) > tol
-        while un_conv and count < max_iter:
-            B_guess = B_next
-            f = self.piB(B_guess) - self.g
-            dfdx = self.dpiB(B_guess)
-            d2fdx2 = self.d2piB2(B_guess)
-            B_next = B_guess - ((2*f*dfdx) / (2*(dfdx**2) - (f*d2fdx2)))
-            un_conv = np.abs(B_next - B_guess) > tol
+        B_lo = 0.
+        B_hi = max(B_guess, 1.)
+        pi_hi = self.piB(B_hi)
+        while pi_hi < self.g and count < max_iter:
+            B_lo = B_hi
+            B_hi *= 2.
+            pi_hi = self.piB(B_hi)
             count += 1
-        return B_next, un_conv, count
+        if isnan(pi_hi) or pi_hi < self.g:
+            # the root is not bracketed
+            return np.nan, True, count
+        B_next, res = brentq(self.pi_minus_g, B_lo, B_hi,
+                             xtol=tol, maxiter=max_iter, full_output=True,
+                             disp=False)
+        return B_next, not res.converged, count + res.iterations
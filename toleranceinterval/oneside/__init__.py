@@ -3,3 +3,4 @@ from .oneside import lognormal  # noqa F401
 from .oneside import non_parametric  # noqa F401
 from .oneside import hanson_koopmans  # noqa F401
 from .oneside import hanson_koopmans_cmh  # noqa F401
+from .oneside import hanson_koopmans_batch  # noqa F401
@@ -21,10 +21,90 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from functools import lru_cache
+from warnings import warn
 import numpy as np
-from scipy.stats import binom, norm, nct
+from scipy.stats import binom, nct
+from scipy.special import betainc, ndtri
 from ..hk import HansonKoopmans
-from ..checks import numpy_array, assert_2d_sort
+from .._hk_table import lookup
+from ..checks import numpy_array, assert_2d
+from ..checks import assert_2d_partition, float_dtype, mean_std
+
+
+# p and g are rounded to this many decimals before solving
+DECIMALS = 12
+
+# below this sample size the non-parametric rank evaluates the whole
+# confidence index in one vectorized call instead of bisecting
+BISECT_MIN_N = 64
+
+NON_PARAMETRIC_WARNING = ('A non-parametric tolerance bound does not exist '
+                          'for this percentile, confidence level, and '
+                          'number of samples!')
+
+
+def _solve_b(p, g, n, j, method, max_iter, tol, step_size):
+    # round p and g so that equivalent inputs, e.g. 1 - 0.9 and 0.1, share
+    # the cache and the precomputed table
+    return _solve_b_cached(round(float(p), DECIMALS),
+                           round(float(g), DECIMALS), int(n), int(j), method,
+                           max_iter, tol, step_size)
+
+
+@lru_cache(maxsize=1024)
+def _solve_b_cached(p, g, n, j, method, max_iter, tol, step_size):
+    # returns (b, fall_back, un_conv) for the HansonKoopmans bound
+    # use the precomputed b for the standard A-basis and B-basis cells
+    cell = lookup(p, g, n, j)
+    if cell is not None:
+        b, fall_back = cell
+        return b, fall_back, False
+    myhk = HansonKoopmans(p, g, n, j, method=method, max_iter=max_iter,
+                          tol=tol, step_size=step_size)
+    if myhk.fall_back:
+        return np.nan, True, False
+    return float(myhk.b), False, bool(myhk.un_conv)
+
+
+@lru_cache(maxsize=512)
+def _non_parametric_rank(n, p, g):
+    # returns the order statistic index for non_parametric, or None
+    r = np.arange(0, n)
+    # the rank only depends on n, p, and g; the confidence index is monotone
+    # in r, so the rank is found with a binary search
+    if p < 0.5 and n >= BISECT_MIN_N:
+        # largest r where betainc(r + 1, n - r, p) >= g, bisecting on scalar
+        # evaluations instead of evaluating all n
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if betainc(mid + 1.0, n - mid, p) >= g:
+                lo = mid + 1
+            else:
+                hi = mid
+        k = lo - 1
+    elif p < 0.5:
+        # largest r where binom.sf(r, n, p) >= g, the survival function is
+        # the regularized incomplete beta function I_p(r + 1, n - r)
+        confidence_index = betainc(r + 1.0, n - r, p)
+        k = np.searchsorted(-confidence_index, -g, side='right') - 1
+    else:
+        # smallest r where binom.cdf(r, n, p) >= g
+        confidence_index = binom.cdf(r, n, p)
+        k = np.searchsorted(confidence_index, g, side='left')
+    if k < 0 or k >= n:
+        return None
+    return int(k)
+
+
+@lru_cache(maxsize=256)
+def _normal_factor(n, p, g):
+    # the one-sided factor only depends on n, p, and g, caching it skips the
+    # nct.ppf root finding when the same bound is computed repeatedly
+    zp = ndtri(p)
+    t = nct.ppf(g, df=n-1., nc=np.sqrt(n)*zp)
+    return float(t / np.sqrt(n))
 
 
 def normal(x, p, g):
@@ -78,20 +158,24 @@ def normal(x, p, g):
 
     """
     x = numpy_array(x)  # check if numpy array, if not make numpy array
-    x = assert_2d_sort(x)
+    x = assert_2d(x)
+    return _normal(x, p, g)
+
+
+def _normal(x, p, g, overwrite_x=False):
     m, n = x.shape
     if p < 0.5:
         p = 1.0 - p
         minus = True
     else:
         minus = False
-    zp = norm.ppf(p)
-    t = nct.ppf(g, df=n-1., nc=np.sqrt(n)*zp)
-    k = t / np.sqrt(n)
+    # keep float32 input in float32
+    k = float_dtype(x).type(_normal_factor(int(n), float(p), float(g)))
+    mean, std = mean_std(x, overwrite_x)
     if minus:
-        return x.mean(axis=1) - (k*x.std(axis=1, ddof=1))
+        return mean - k*std
     else:
-        return x.mean(axis=1) + (k*x.std(axis=1, ddof=1))
+        return mean + k*std
 
 
 def lognormal(x, p, g):
@@ -134,8 +218,11 @@ def lognormal(x, p, g):
 
     """
     x = numpy_array(x)  # check if numpy array, if not make numpy array
-    x = assert_2d_sort(x)
-    return np.exp(normal(np.log(x), p, g))
+    x = assert_2d(x)
+    # the log transformed copy is only needed for its moments, so let the
+    # normal bound reuse it as scratch space
+    bound = _normal(np.log(x), p, g, overwrite_x=True)
+    return np.exp(bound, out=bound)
 
 
 def non_parametric(x, p, g):
@@ -152,17 +239,20 @@ def non_parametric(x, p, g):
         Numpy array of samples to compute the tolerance bound. Assumed data
         type is np.float. Shape of (m, n) is assumed for 2-D arrays with m
         number of sets of sample size n.
-    p : float
-        Percentile for the TI to estimate.
-    g : float
-        Confidence level where g > 0. and g < 1.
+    p : float or ndarray (1-D)
+        Percentile for the TI to estimate. An array of shape m gives the
+        percentile for each set of samples.
+    g : float or ndarray (1-D)
+        Confidence level where g > 0. and g < 1. An array of shape m gives the
+        confidence level for each set of samples.
 
     Returns
     -------
     ndarray (1-D)
         The non-parametric toleranace interval bound. Returns np.nan if a
         non-parametric tolerance interval does not exist for the combination
-        of percentile, confidence level, and number of samples.
+        of percentile, confidence level, and number of samples, and issues a
+        RuntimeWarning.
 
     Notes
     -----
@@ -196,23 +286,31 @@ def non_parametric(x, p, g):
 
     """
     x = numpy_array(x)  # check if numpy array, if not make numpy array
-    x = assert_2d_sort(x)
+    x = assert_2d(x)
     m, n = x.shape
-    r = np.arange(0, n)
-    if p < 0.5:
-        left_tail = True
-        confidence_index = binom.sf(r, n, p)
-    else:
-        left_tail = False
-        confidence_index = binom.cdf(r, n, p)
-    boolean_index = confidence_index >= g
-    if boolean_index.sum() > 0:
-        if left_tail:
-            return x[:, np.max(np.where(boolean_index))]
-        else:
-            return x[:, np.min(np.where(boolean_index))]
-    else:
-        return np.nan*np.ones(m)
+    if np.ndim(p) > 0 or np.ndim(g) > 0:
+        # a different order statistic for each set of samples, the rank is
+        # solved once per unique (p, g)
+        pg = list(zip(np.broadcast_to(p, m).tolist(),
+                      np.broadcast_to(g, m).tolist()))
+        ranks = {key: _non_parametric_rank(int(n), *key) for key in set(pg)}
+        k = np.array([-1 if ranks[key] is None else ranks[key] for key in pg])
+        if (k < 0).any():
+            warn(NON_PARAMETRIC_WARNING, RuntimeWarning)
+        bound = np.full(m, np.nan, dtype=float_dtype(x))
+        # only the k-th order statistic of each set is needed
+        for k_i in np.unique(k[k >= 0]):
+            rows = k == k_i
+            bound[rows] = np.partition(x[rows], k_i, axis=-1)[:, k_i]
+        return bound
+    # plain Python scalars so that 0-d arrays and numpy scalars share the cache
+    k = _non_parametric_rank(int(n), float(p), float(g))
+    if k is None:
+        warn(NON_PARAMETRIC_WARNING, RuntimeWarning)
+        return np.full(m, np.nan, dtype=float_dtype(x))
+    # only the k-th order statistic is needed
+    x = assert_2d_partition(x, k)
+    return x[:, k]
 
 
 def hanson_koopmans(x, p, g, j=-1, method='secant', max_iter=200, tol=1e-5,
@@ -243,7 +341,8 @@ def hanson_koopmans(x, p, g, j=-1, method='secant', max_iter=200, tol=1e-5,
     method : string, optional
         Which rootfinding method to use to solve for the Hanson-Koopmans
         bound. Default is method='secant' which appears to converge
-        quickly. Other choices include 'newton-raphson' and 'halley'.
+        quickly. Other choices include 'newton-raphson', 'halley', and
+        'brentq', which brackets the root before using Brent's method.
     max_iter : int, optional
         Maximum number of iterations for the root finding method.
     tol : float, optional
@@ -268,6 +367,10 @@ def hanson_koopmans(x, p, g, j=-1, method='secant', max_iter=200, tol=1e-5,
 
     j uses Python style index notation.
 
+    The b factors for the standard A-basis (p=0.01, g=0.95) and B-basis
+    (p=0.1, g=0.95) cells are precomputed. The root finding options are
+    ignored for these cells.
+
 
     References
     ----------
@@ -291,31 +394,33 @@ def hanson_koopmans(x, p, g, j=-1, method='secant', max_iter=200, tol=1e-5,
 
     """
     x = numpy_array(x)  # check if numpy array, if not make numpy array
-    x = assert_2d_sort(x)
-    m, n = x.shape
+    m, n = assert_2d(x).shape
     if j == -1:
         # Need to use n for the HansonKoopmans solver
         j = n - 1
     assert j < n
     if p < 0.5:
-        lower = True
-        myhk = HansonKoopmans(p, g, n, j, method=method, max_iter=max_iter,
-                              tol=tol, step_size=step_size)
+        p_hk = p
+        # extrapolate from x[:, j] towards x[:, 0]
+        i0, i1 = j, 0
     else:
-        lower = False
-        myhk = HansonKoopmans(1.0-p, g, n, j, method=method, max_iter=max_iter,
-                              tol=tol, step_size=step_size)
-    if myhk.fall_back:
+        p_hk = 1.0 - p
+        # extrapolate from x[:, n-j-1] towards x[:, n-1]
+        i0, i1 = n-j-1, n-1
+    b, fall_back, un_conv = _solve_b(p_hk, g, n, j, method, max_iter, tol,
+                                     step_size)
+    if fall_back:
         return non_parametric(x, p, g)
-    if myhk.un_conv:
+    if un_conv:
         return np.nan
-    else:
-        b = float(myhk.b)
-        if lower:
-            bound = x[:, j] - b*(x[:, j]-x[:, 0])
-        else:
-            bound = b*(x[:, n-1] - x[:, n-j-1]) + x[:, n-j-1]
-        return bound
+    # only the two order statistics are needed
+    x = assert_2d_partition(x, [i1, i0])
+    # bound = x[:, i0] + b*(x[:, i1] - x[:, i0]) in a single buffer
+    dtype = float_dtype(x)
+    bound = np.subtract(x[:, i1], x[:, i0], dtype=dtype)
+    np.multiply(bound, dtype.type(b), out=bound)
+    np.add(bound, x[:, i0], out=bound)
+    return bound
 
 
 def hanson_koopmans_cmh(x, p, g, j=-1, method='secant', max_iter=200, tol=1e-5,
@@ -347,7 +452,8 @@ def hanson_koopmans_cmh(x, p, g, j=-1, method='secant', max_iter=200, tol=1e-5,
     method : string, optional
         Which rootfinding method to use to solve for the Hanson-Koopmans
         bound. Default is method='secant' which appears to converge
-        quickly. Other choices include 'newton-raphson' and 'halley'.
+        quickly. Other choices include 'newton-raphson', 'halley', and
+        'brentq', which brackets the root before using Brent's method.
     max_iter : int, optional
         Maximum number of iterations for the root finding method.
     tol : float, optional
@@ -372,6 +478,10 @@ def hanson_koopmans_cmh(x, p, g, j=-1, method='secant', max_iter=200, tol=1e-5,
 
     j uses Python style index notation.
 
+    The b factors for the standard A-basis (p=0.01, g=0.95) and B-basis
+    (p=0.1, g=0.95) cells are precomputed. The root finding options are
+    ignored for these cells.
+
     CMH variant estimates lower tails only!
 
 
@@ -400,21 +510,99 @@ def hanson_koopmans_cmh(x, p, g, j=-1, method='secant', max_iter=200, tol=1e-5,
 
     """
     x = numpy_array(x)  # check if numpy array, if not make numpy array
-    x = assert_2d_sort(x)
-    m, n = x.shape
+    m, n = assert_2d(x).shape
     if j == -1:
         # Need to use n for the HansonKoopmans solver
         j = n - 1
     assert j < n
     if p >= 0.5:
         raise ValueError('p must be < 0.5!')
-    myhk = HansonKoopmans(p, g, n, j, method=method, max_iter=max_iter,
-                          tol=tol, step_size=step_size)
-    if myhk.fall_back:
+    b, fall_back, un_conv = _solve_b(p, g, n, j, method, max_iter, tol,
+                                     step_size)
+    if fall_back:
         return non_parametric(x, p, g)
-    if myhk.un_conv:
+    if un_conv:
         return np.nan
+    # only the two order statistics are needed
+    x = assert_2d_partition(x, [0, j])
+    # bound = x[:, j] * (x[:, 0]/x[:, j])**b in a single buffer
+    dtype = float_dtype(x)
+    bound = np.divide(x[:, 0], x[:, j], dtype=dtype)
+    np.power(bound, dtype.type(b), out=bound)
+    np.multiply(bound, x[:, j], out=bound)
+    return bound
+
+
+def hanson_koopmans_batch(xs, p, g, j=-1, cmh=False, method='secant',
+                          max_iter=200, tol=1e-5, step_size=1e-4):
+    r"""
+    Compute Hanson-Koopmans bounds for sample sets of different sizes.
+
+    Groups the sample sets by (n, p, g, j), stacks each group into a 2-D
+    array, and computes the bound once per group with hanson_koopmans, or
+    hanson_koopmans_cmh if cmh=True. The b factor is solved once per unique
+    (n, p, g, j).
+
+    Parameters
+    ----------
+    xs : list of ndarray (1-D)
+        Sample sets to compute the tolerance bounds. The sample sets may be
+        of different sizes.
+    p : float or array_like
+        Percentile for each sample set.
+    g : float or array_like
+        Confidence level for each sample set where g > 0. and g < 1.
+    j : int or array_like, optional
+        Index of the second value to use for the second order statistic for
+        each sample set. Default is the last value j = -1 = n-1.
+    cmh : bool, optional
+        Whether to use the CMH variant hanson_koopmans_cmh. Default is False.
+    method : string, optional
+        Which rootfinding method to use to solve for the Hanson-Koopmans
+        bound. Default is method='secant' which appears to converge
+        quickly. Other choices include 'newton-raphson', 'halley', and
+        'brentq', which brackets the root before using Brent's method.
+    max_iter : int, optional
+        Maximum number of iterations for the root finding method.
+    tol : float, optional
+        Tolerance for the root finding method to converge.
+    step_size : float, optional
+        Step size for the secant solver. Default step_size = 1e-4.
+
+    Returns
+    -------
+    ndarray (1-D)
+        The Hanson-Koopmans toleranace interval bound for each sample set.
+
+    Examples
+    --------
+    Estimate the B-basis (10th percentile with 95% confidence) of sample
+    sets with 10, 15, and 20 random samples.
+
+    >>> import numpy as np
+    >>> import toleranceinterval as ti
+    >>> xs = [np.random.random(n) for n in [10, 15, 20]]
+    >>> bounds = ti.oneside.hanson_koopmans_batch(xs, 0.1, 0.95)
+
+    """
+    xs = [numpy_array(x_i) for x_i in xs]
+    m = len(xs)
+    p = np.broadcast_to(p, m)
+    g = np.broadcast_to(g, m)
+    j = np.broadcast_to(j, m)
+    groups = {}
+    for i, x_i in enumerate(xs):
+        if x_i.ndim != 1:
+            raise ValueError('Each sample set must be 1 dimensional')
+        key = (x_i.size, p[i], g[i], int(j[i]))
+        groups.setdefault(key, []).append(i)
+    if cmh:
+        func = hanson_koopmans_cmh
     else:
-        b = float(myhk.b)
-        bound = x[:, j] * (x[:, 0]/x[:, j])**b
-        return bound
+        func = hanson_koopmans
+    bound = np.empty(m)
+    for (n, p_i, g_i, j_i), index in groups.items():
+        bound[index] = func(np.stack([xs[i] for i in index]), p_i, g_i,
+                            j=j_i, method=method, max_iter=max_iter, tol=tol,
+                            step_size=step_size)
+    return bound
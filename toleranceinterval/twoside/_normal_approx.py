@@ -28,10 +28,31 @@ factors under the assumption of a normal distribution.
 """
 
 import numpy as np
-from scipy.stats import norm, chi2
+from scipy.special import chdtri, gammaincinv, ndtri
 
 
-def tolerance_factor_howe(n, p, g, m=None, nu=None):
+def _chi2_lower(nu, g, tailprob):
+    # lower 1 - g quantile of chi2(nu), i.e. the inverse survival function at
+    # g. With tailprob, g is already 1 - g and the lower tail is inverted
+    # directly, which keeps its precision for g close to 1.
+    if tailprob:
+        return 2.0 * gammaincinv(nu / 2.0, g)
+    return chdtri(nu, g)
+
+
+def _howe(n, p, nu, chi2_nu, tailprob):
+    # Howe's factor given the lower chi2 quantile
+    if tailprob:
+        zp = -ndtri(p / 2.0)
+    else:
+        zp = ndtri((1.0 + p) / 2.0)
+    u = zp * np.sqrt(1.0 + (1.0 / n))
+    # nu / chi2_nu tends to 1 as nu grows, chi2.ppf is nan for nu = inf
+    v = np.where(np.isinf(nu), 1.0, np.sqrt(nu / chi2_nu))
+    return u * v
+
+
+def tolerance_factor_howe(n, p, g, m=None, nu=None, tailprob=False):
     r"""
     Compute two-side central tolerance interval factor using Howe's method.
 
@@ -41,23 +62,27 @@ def tolerance_factor_howe(n, p, g, m=None, nu=None):
 
     Parameters
     ----------
-    n : scalar
-        Sample size.
+    n : scalar or array_like
+        Sample size, may be np.inf.
     p : float
         Percentile for central TI to estimate.
     g : float
         Confidence level where g > 0. and g < 1.
-    m : scalar
+    m : scalar or array_like
         Number of independent random samples (of size n). If None,
         default value is m = 1.
-    nu : scalar
+    nu : scalar or array_like
         Degrees of freedom for distribution of the (pooled) sample
         variance. If None, default value is nu = m*(n-1).
+    tailprob : boolean
+        If True, p and g are given as the tail coverage (i.e. 1 - p) and
+        tail confidence (i.e. 1 - g). Default value is False.
 
     Returns
     -------
-    float
-        The calculated tolerance factor for the tolerance interval.
+    float or ndarray
+        The calculated tolerance factor for the tolerance interval, an array
+        of the broadcast shape of the inputs if any of them is an array.
 
     References
     ----------
@@ -72,16 +97,11 @@ def tolerance_factor_howe(n, p, g, m=None, nu=None):
     if nu is None:
         nu = m * (n - 1)
 
-    alpha = 1.0 - g
-    zp = norm.ppf((1.0 + p) / 2.0)
-    u = zp * np.sqrt(1.0 + (1.0 / n))
-    chi2_nu = chi2.ppf(alpha, df=nu)
-    v = np.sqrt(nu / chi2_nu)
-    k = u * v
-    return k
+    chi2_nu = _chi2_lower(nu, g, tailprob)
+    return _howe(n, p, nu, chi2_nu, tailprob)
 
 
-def tolerance_factor_guenther(n, p, g, m=None, nu=None):
+def tolerance_factor_guenther(n, p, g, m=None, nu=None, tailprob=False):
     r"""
     Compute two-side central tolerance interval factor using Guenther's method.
 
@@ -92,23 +112,27 @@ def tolerance_factor_guenther(n, p, g, m=None, nu=None):
 
     Parameters
     ----------
-    n : scalar
-        Sample size.
+    n : scalar or array_like
+        Sample size, may be np.inf.
     p : float
         Percentile for central TI to estimate.
     g : float
         Confidence level where g > 0. and g < 1.
-    m : scalar
+    m : scalar or array_like
         Number of independent random samples (of size n). If None,
         default value is m = 1.
-    nu : scalar
+    nu : scalar or array_like
         Degrees of freedom for distribution of the (pooled) sample
         variance. If None, default value is nu = m*(n-1).
+    tailprob : boolean
+        If True, p and g are given as the tail coverage (i.e. 1 - p) and
+        tail confidence (i.e. 1 - g). Default value is False.
 
     Returns
     -------
-    float
-        The calculated tolerance factor for the tolerance interval.
+    float or ndarray
+        The calculated tolerance factor for the tolerance interval, an array
+        of the broadcast shape of the inputs if any of them is an array.
 
     References
     ----------
@@ -122,9 +146,11 @@ def tolerance_factor_guenther(n, p, g, m=None, nu=None):
     if nu is None:
         nu = m * (n - 1)
 
-    k = tolerance_factor_howe(n, p, g, m, nu)
-    alpha = 1.0 - g
-    chi2_nu = chi2.ppf(alpha, df=nu)
+    # Guenther's correction of Howe's factor uses the same chi2 quantile
+    chi2_nu = _chi2_lower(nu, g, tailprob)
+    k = _howe(n, p, nu, chi2_nu, tailprob)
     w = np.sqrt(1.0 + ((n - 3.0 - chi2_nu) / (2.0 * (n + 1.0) ** 2)))
-    k *= w
+    # the correction vanishes for n = inf
+    w = np.where(np.isinf(n), 1.0, w)
+    k = k * w
     return k
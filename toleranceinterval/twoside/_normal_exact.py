@@ -44,14 +44,38 @@ OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 -------------------------------------------------------------------------------
 """
 
+from functools import lru_cache
+import math
 import numpy as np
-import scipy.stats as stats
+from numpy.polynomial.legendre import leggauss
 import scipy.special as spec
 import scipy.integrate as integ
 import scipy.optimize as optim
 
 SQRT_2 = 1.4142135623730950488
 SQRT_2PI = 2.5066282746310005024
+INV_SQRT_2PI = 0.39894228040143267794
+EPS = np.finfo(float).eps
+
+# The integral over [A, B] is first tried with a fixed Gauss-Legendre rule
+# that solves for the roots at all nodes at once. The rule is checked against
+# one with twice the nodes, and the adaptive quad is used if they disagree by
+# more than GL_RTOL relative to the tail confidence (a sharp integrand, e.g.
+# large nu*d2 or many simultaneous intervals).
+GL_NODES = 64
+GL_RTOL = 1e-10
+
+
+@lru_cache(maxsize=8)
+def _leggauss(nodes, A, B):
+    # nodes and weights of an n-point Gauss-Legendre rule on [A, B]
+    x, w = leggauss(nodes)
+    half = 0.5 * (B - A)
+    z = half * (x + 1.0) + A
+    w = half * w
+    z.setflags(write=False)
+    w.setflags(write=False)
+    return z, w
 
 
 def tolerance_factor(n, coverage, confidence, m=None, nu=None, d2=None,
@@ -217,11 +241,41 @@ def tolerance_factor(n, coverage, confidence, m=None, nu=None, d2=None,
         k0, _ = _approx_tol_factor_wald_wolfowitz(
             tailcoverage, tailconfidence, d2, nu)
 
-    # Compute the tolerance factor.
-    sol = optim.newton(lambda k: (_integral_gauss_kronod(
-        k, nu, m, d2, tailcoverage, simultaneous, A, B, tol_high_precision)
-        - tailconfidence), k0)
-    k = sol
+    # The roots and the quadrature weights of the fixed rule do not depend
+    # on k, so they are computed once for all of the Newton iterations.
+    ncx2pts_lo, weights_lo = _gauss_legendre_terms(
+        nu, m, d2, tailcoverage, simultaneous, A, B, GL_NODES)
+    ncx2pts, weights = _gauss_legendre_terms(
+        nu, m, d2, tailcoverage, simultaneous, A, B, 2 * GL_NODES)
+
+    # gammainc(nu/2, ncx2pts/k**2/2), with nu/2 and ncx2pts/2 hoisted. The
+    # halving is exact, so this matches the quad integrand.
+    a = nu / 2.0
+    ncx2pts_lo /= 2.0
+    ncx2pts /= 2.0
+
+    def rules_agree(k):
+        val_lo = _integral_gauss_legendre(k, a, ncx2pts_lo, weights_lo)
+        val_hi = _integral_gauss_legendre(k, a, ncx2pts, weights)
+        return abs(val_hi - val_lo) <= GL_RTOL * tailconfidence
+
+    # Compute the tolerance factor with the fixed rule if it has converged
+    # at the starting value and at the root it finds.
+    k = k0
+    if rules_agree(k0):
+        def fun(k):
+            return _integral_gauss_legendre(k, a, ncx2pts,
+                                            weights) - tailconfidence
+        k = optim.newton(fun, k0)
+        if rules_agree(k):
+            return k
+
+    # Otherwise use the adaptive quadrature, starting from the last k.
+    def fun(k):
+        return _integral_gauss_kronod(
+            k, nu, m, d2, tailcoverage, simultaneous, A, B,
+            tol_high_precision) - tailconfidence
+    k = optim.newton(fun, k)
 
     return k
 
@@ -237,8 +291,35 @@ def _integral_gauss_kronod(k, nu, m, c, tailcoverage, simultaneous, A, B, tol):
     SciPy default tolerances, which seem to be adequate.)
 
     """
-    val, _ = integ.quad(lambda z: _integrand(
-        z, k, nu, m, c, tailcoverage, simultaneous), A, B)
+    # pass the parameters through args so quad calls _integrand directly
+    val, _ = integ.quad(_integrand, A, B,
+                        args=(k, nu, m, c, tailcoverage, simultaneous))
+    val *= 2
+    return val
+
+
+def _gauss_legendre_terms(nu, m, c, tailcoverage, simultaneous, A, B, nodes):
+    r"""
+    Noncentral chi-square points and weights of the fixed Gauss-Legendre
+    rule with the given number of nodes. The Halley iterations for the roots
+    are done at all nodes at once.
+
+    """
+    z, w = _leggauss(nodes, A, B)
+    ncx2pts, factor = _integrand_terms(z, nu, m, c, tailcoverage,
+                                       simultaneous)
+    return ncx2pts, w * factor
+
+
+def _integral_gauss_legendre(k, a, half_ncx2pts, weights):
+    r"""
+    Evaluates the same integral as _integral_gauss_kronod with the fixed
+    Gauss-Legendre rule from _gauss_legendre_terms, a = nu/2 and
+    half_ncx2pts = ncx2pts/2.
+
+    """
+    x = half_ncx2pts / k ** 2
+    val = np.dot(weights, spec.gammainc(a, x, out=x))
     val *= 2
     return val
 
@@ -247,6 +328,19 @@ def _integrand(z, k, nu, m, c, tailcoverage, simultaneous):
     r"""
     Integrand for Gauss-Kronod quadrature.
 
+    """
+    ncx2pts, factor = _integrand_terms(z, nu, m, c, tailcoverage,
+                                       simultaneous)
+    x = ncx2pts / k ** 2
+    fun = spec.gammainc(nu / 2.0, x / 2.0) * factor
+    return fun
+
+
+def _integrand_terms(z, nu, m, c, tailcoverage, simultaneous):
+    r"""
+    The parts of the integrand that do not depend on k, z may be an array of
+    nodes.
+
     """
     root = _find_root(np.sqrt(c) * z, tailcoverage)
     ncx2pts = nu * root**2
@@ -255,9 +349,7 @@ def _integrand(z, k, nu, m, c, tailcoverage, simultaneous):
     if simultaneous:
         factor = factor * (m * (1 - (spec.erfc(z / SQRT_2))) ** (m - 1))
 
-    x = ncx2pts / k ** 2
-    fun = spec.gammainc(nu / 2.0, x / 2.0) * factor
-    return fun
+    return ncx2pts, factor
 
 
 def _find_root(x, tailcoverage):
@@ -282,24 +374,55 @@ def _find_root(x, tailcoverage):
     max_iterations = 100
     iteration = 0
 
-    # Set the appropriate tolerance
+    # Set the appropriate tolerance. |fun| may never get below tol due to
+    # rounding, so a root also stops once the Halley step is within a few
+    # units of round-off of r.
     if np.spacing(tailcoverage) < np.spacing(1):
         tol = min(10 * np.spacing(tailcoverage), np.spacing(1))
 
+    # A single root, e.g. for quad, is iterated on Python floats
+    if np.ndim(x) == 0:
+        # Set the starting value of the root r: r0 = x + norminv(coverage)
+        r = float(x + SQRT_2 * spec.erfcinv(2 * tailcoverage))
+
+        # Main loop (Halley's method)
+        while True:
+            iteration += 1
+            fun, fun_d1, fun_d2 = _complementary_content(r, x, tailcoverage)
+            # Halley's method
+            step = 2 * fun * fun_d1 / (2 * fun_d1 ** 2 - fun * fun_d2)
+            r = r - step
+            if iteration > max_iterations:
+                break
+            if abs(fun) < tol or abs(step) <= 4 * EPS * abs(r):
+                break
+        return r
+
     # Set the starting value of the root r: r0 = x + norminv(coverage)
+    x = np.asarray(x, dtype=float)
     r = x + SQRT_2 * spec.erfcinv(2 * tailcoverage)
-
-    # Main loop (Halley's method)
+    shape = r.shape
+    x = x.ravel()
+    r = r.ravel()
+
+    # Main loop (Halley's method), x may be an array. Each root stops at the
+    # first iteration where its own |fun| < tol, near the root |fun| can
+    # cycle around tol so the roots can not wait for each other.
+    active = np.arange(r.size)
     while True:
         iteration += 1
-        fun, fun_d1, fun_d2 = _complementary_content(r, x, tailcoverage)
+        fun, fun_d1, fun_d2 = _complementary_content(r[active], x[active],
+                                                     tailcoverage)
         # Halley's method
-        r = r - 2 * fun * fun_d1 / (2 * fun_d1 ** 2 - fun * fun_d2)
+        step = 2 * fun * fun_d1 / (2 * fun_d1 ** 2 - fun * fun_d2)
+        r[active] -= step
         if iteration > max_iterations:
             break
-        if np.all(np.abs(fun) < tol):
+        active = active[(np.abs(fun) >= tol) &
+                        (np.abs(step) > 4 * EPS * np.abs(r[active]))]
+        if active.size == 0:
             break
-    return r
+    return r.reshape(shape)[()]
 
 
 def _complementary_content(r, x, tailcoverage):
@@ -316,24 +439,43 @@ def _complementary_content(r, x, tailcoverage):
     fun(r|x,tailcoverage)
 
     """
+    if np.ndim(r) == 0:
+        # the math module avoids the ufunc overhead for scalars
+        erfc, exp = math.erfc, math.exp
+    else:
+        erfc, exp = spec.erfc, np.exp
+    xpr = x + r
+    xmr = x - r
     fun = 0.5 * (
-        spec.erfc((x + r) / SQRT_2)
-        + spec.erfc(-(x - r) / SQRT_2)
+        erfc(xpr / SQRT_2)
+        + erfc(-xmr / SQRT_2)
     ) - tailcoverage
-    aux1 = np.exp(-0.5 * (x + r)**2)
-    aux2 = np.exp(-0.5 * (x - r)**2)
-    fun_d1 = -(aux1 + aux2) / SQRT_2PI
-    fun_d2 = -((x - r) * aux2 - (x + r) * aux1) / SQRT_2PI
+    aux1 = exp(-0.5 * xpr * xpr)
+    aux2 = exp(-0.5 * xmr * xmr)
+    fun_d1 = -(aux1 + aux2) * INV_SQRT_2PI
+    fun_d2 = -(xmr * aux2 - xpr * aux1) * INV_SQRT_2PI
     return (fun, fun_d1, fun_d2)
 
 
+def _chi2_ppf(q, nu):
+    r"""
+    Chi-square quantile, the same as scipy.stats.chi2.ppf(q, nu).
+
+    The lower tail is inverted directly, so q may be as small as the tail
+    probabilities used with tailprob=True without losing precision, which
+    spec.chdtri(nu, 1 - q) would.
+
+    """
+    return 2.0 * spec.gammaincinv(0.5 * nu, q)
+
+
 def _approx_tol_factor_wald_wolfowitz(tailcoverage, tailconfidence, c, nu):
     r"""
     Compute the approximate tolerance factor (Wald-Wolfowitz).
 
     """
     r = _find_root(np.sqrt(c), tailcoverage)
-    k = r * np.sqrt(nu / stats.chi2.ppf(tailconfidence, nu))
+    k = r * np.sqrt(nu / _chi2_ppf(tailconfidence, nu))
     return (k, r)
 
 
@@ -342,9 +484,11 @@ def _approx_tol_factor_witkovsky(tailcoverage, tailconfidence, c, m, nu, A, B):
     Compute the approximate tolerance factor (Witkovsky).
 
     """
-    val, _ = integ.quad(lambda z: _expect_fun(z, c, tailcoverage, m), A, B)
+    # only a starting value, so the fixed rule is used without a check
+    z, w = _leggauss(2 * GL_NODES, A, B)
+    val = np.dot(w, _expect_fun(z, c, tailcoverage, m))
     r = np.sqrt(2 * val)
-    k = r * np.sqrt(nu / stats.chi2.ppf(tailconfidence, nu))
+    k = r * np.sqrt(nu / _chi2_ppf(tailconfidence, nu))
     return (k, r)
 
 
@@ -354,7 +498,7 @@ def _expect_fun(z, c, tailcoverage, m):
 
     """
     r = _find_root(np.sqrt(c) * z, tailcoverage)
-    f = r ** 2 * stats.norm.pdf(z)
+    f = r ** 2 * np.exp(-0.5 * z * z) * INV_SQRT_2PI
     if m > 1:
         f = f * (m * (1 - (spec.erfc(z / SQRT_2))) ** (m - 1))
     return f
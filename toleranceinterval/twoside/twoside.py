@@ -21,12 +21,34 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from functools import lru_cache
 import numpy as np
-from ..checks import numpy_array, assert_2d_sort
+from ..checks import numpy_array, assert_2d, float_dtype, mean_std
 from . import _normal_exact as exact
 from . import _normal_approx as approx
 
 
+def _exact_factor(n, p, g, m, nu, d2, simultaneous, tailprob):
+    # plain Python scalars so that 0-d arrays and numpy scalars share the cache
+    def _float(a):
+        return None if a is None else float(a)
+    return _exact_factor_cached(float(n), float(p), float(g), _float(m),
+                                _float(nu), _float(d2), bool(simultaneous),
+                                bool(tailprob))
+
+
+@lru_cache(maxsize=1024)
+def _exact_factor_cached(n, p, g, m, nu, d2, simultaneous, tailprob):
+    # the exact factor is a quadrature inside a root find, repeated queries
+    # (e.g. many sample sets of the same size) reuse the result
+    return exact.tolerance_factor(n, p, g, m, nu, d2, simultaneous, tailprob)
+
+
+# the exact factor is a scalar root find, evaluate it per element for arrays
+_exact_tolerance_factor = np.vectorize(_exact_factor, otypes=[float],
+                                       excluded={4, 5, 6, 7})
+
+
 def normal_factor(n, p, g, method=None, m=None, nu=None, d2=None,
                   simultaneous=False, tailprob=False):
     r"""
@@ -75,18 +97,18 @@ def normal_factor(n, p, g, method=None, m=None, nu=None, d2=None,
 
     Parameters
     ----------
-    n : scalar
+    n : scalar or array_like
         Sample size
-    p : scalar in the interval [0.0, 1.0]
+    p : scalar or array_like in the interval [0.0, 1.0]
         Coverage (or content) probability,
         Prob( Xmean - k * S < X < Xmean + k * S ) >= p
-    g : scalar in the interval [0.0, 1.0]
+    g : scalar or array_like in the interval [0.0, 1.0]
         Confidence probability,
         Prob[ Prob( Xmean-k*S < X < Xmean+k*S ) >= p ] = g.
     method : str
         Method to use for computing the factor. Available methods are 'exact',
         'howe', and 'guenther'. If None, the default method is 'exact'.
-    m : scalar
+    m : scalar or array_like
         Number of independent random samples (of size n). If None,
         default value is m = 1.
     nu : scalar
@@ -115,8 +137,10 @@ def normal_factor(n, p, g, method=None, m=None, nu=None, d2=None,
 
     Returns
     -------
-    float
-        The calculated tolerance factor for the tolerance interval.
+    float or ndarray
+        The calculated tolerance factor for the tolerance interval. If any of
+        n, p, g, or m is an array, they are broadcast together and an array
+        of factors is returned.
 
     References
     ----------
@@ -153,17 +177,32 @@ def normal_factor(n, p, g, method=None, m=None, nu=None, d2=None,
         Journal of Statistical Computation and Simulation, 92:1, 101-114,
         DOI: 10.1080/00949655.2021.1932885
 
+    Examples
+    --------
+    Tabulate the 90% coverage, 95% confidence factors for sample sizes 2 to
+    100 once, and look up k by sample size afterwards.
+
+    >>> import numpy as np
+    >>> import toleranceinterval as ti
+    >>> n_range = np.arange(2, 101)
+    >>> k_table = ti.twoside.normal_factor(n_range, 0.9, 0.95)
+    >>> k = k_table[30 - n_range[0]]
+
     """
     # Handle default method:
     if method is None:
         method = 'exact'
 
     if method == 'exact':
-        k = exact.tolerance_factor(n, p, g, m, nu, d2, simultaneous, tailprob)
+        if np.ndim(n) or np.ndim(p) or np.ndim(g) or np.ndim(m):
+            k = _exact_tolerance_factor(n, p, g, m, nu, d2, simultaneous,
+                                        tailprob)
+        else:
+            k = _exact_factor(n, p, g, m, nu, d2, simultaneous, tailprob)
     elif method == 'howe':
-        k = approx.tolerance_factor_howe(n, p, g, m, nu)
+        k = approx.tolerance_factor_howe(n, p, g, m, nu, tailprob)
     elif method == 'guenther':
-        k = approx.tolerance_factor_guenther(n, p, g, m, nu)
+        k = approx.tolerance_factor_guenther(n, p, g, m, nu, tailprob)
     else:
         raise ValueError(
             "Invalid method requested. Valid methods are 'exact', 'howe', or "
@@ -239,7 +278,11 @@ def normal(x, p, g, method=None, pool_variance=False):
 
     """
     x = numpy_array(x)  # check if numpy array, if not make numpy array
-    x = assert_2d_sort(x)
+    x = assert_2d(x)
+    return _normal(x, p, g, method, pool_variance)
+
+
+def _normal(x, p, g, method, pool_variance, overwrite_x=False):
     m, n = x.shape
 
     # Handle pooled variance case
@@ -248,12 +291,15 @@ def normal(x, p, g, method=None, pool_variance=False):
     else:
         _m = 1
 
-    k = normal_factor(n, p, g, method, _m)
-    bound = np.zeros((m, 2))
-    xmu = x.mean(axis=1)
-    kstd = k * x.std(axis=1, ddof=1)
-    bound[:, 0] = xmu - kstd
-    bound[:, 1] = xmu + kstd
+    # keep float32 input in float32
+    dtype = float_dtype(x)
+    k = dtype.type(normal_factor(n, p, g, method, _m))
+    xmu, xstd = mean_std(x, overwrite_x)
+    kstd = k * xstd
+    # every element is written, straight into the columns of the output
+    bound = np.empty((m, 2), dtype=dtype)
+    np.subtract(xmu, kstd, out=bound[:, 0])
+    np.add(xmu, kstd, out=bound[:, 1])
     return bound
 
 
@@ -307,5 +353,8 @@ def lognormal(x, p, g, method=None, pool_variance=False):
 
     """
     x = numpy_array(x)  # check if numpy array, if not make numpy array
-    x = assert_2d_sort(x)
-    return np.exp(normal(np.log(x), p, g, method, pool_variance))
+    x = assert_2d(x)
+    # the log transformed copy is only needed for its moments, so let the
+    # normal bound reuse it as scratch space
+    bound = _normal(np.log(x), p, g, method, pool_variance, overwrite_x=True)
+    return np.exp(bound, out=bound)